@@ -0,0 +1,192 @@
+"""
+Memory-mapped Fashion-MNIST loader.
+
+The first load of a split streams its CSV (label followed by 784 pixel
+columns) in chunks into two uint8 .npy files, images (n, 28, 28, 1) and
+labels (n,). Later loads memory-map those files, so startup reads no text
+and nothing is copied until a batch asks for it. Batches turns a split, or
+an index view of it, into normalized float32 mini-batches one at a time.
+"""
+
+import math
+import os
+import tempfile
+
+import numpy as np
+
+CSV_FILES = {"train": "fashion-mnist_train.csv", "test": "fashion-mnist_test.csv"}
+IMAGE_SHAPE = (28, 28, 1)
+CLASS_NAMES = ["T-shirt/top", "Trouser", "Pullover", "Dress", "Coat",
+               "Sandal", "Shirt", "Sneaker", "Bag", "Ankle boot"]
+
+
+def _npy_paths(csv_path, cache_dir):
+    stem = os.path.splitext(os.path.basename(csv_path))[0]
+    return (os.path.join(cache_dir, f"{stem}_images.npy"),
+            os.path.join(cache_dir, f"{stem}_labels.npy"))
+
+
+def _count_rows(csv_path):
+    # Upper bound on the data rows: every line but the header, blank ones included.
+    # A last line without a trailing newline still counts
+    lines, last = 0, b"\n"
+    with open(csv_path, "rb") as f:
+        for chunk in iter(lambda: f.read(2 ** 20), b""):
+            lines += chunk.count(b"\n")
+            last = chunk[-1:]
+    if last != b"\n":
+        lines += 1
+    return max(lines - 1, 0)
+
+
+def _write_atomic(path, write):
+    # Written under a temporary name so an interrupted conversion is never mistaken for a finished one
+    fd, temporary = tempfile.mkstemp(dir=os.path.dirname(path), suffix=".npy.tmp")
+    os.close(fd)
+    try:
+        write(temporary)
+        os.replace(temporary, path)
+    except BaseException:
+        os.remove(temporary)
+        raise
+
+
+def convert_csv(csv_path, images_path, labels_path, chunk_rows=10000):
+    """Stream a Fashion-MNIST CSV into uint8 images and labels .npy files."""
+    import pandas as pd
+
+    n = _count_rows(csv_path)
+    labels = np.empty(n, dtype=np.uint8)
+    rows = 0
+
+    def write_images(path):
+        nonlocal rows
+        images = np.lib.format.open_memmap(path, mode="w+", dtype=np.uint8, shape=(n,) + IMAGE_SHAPE)
+        for chunk in pd.read_csv(csv_path, dtype=np.uint8, chunksize=chunk_rows):
+            values = chunk.to_numpy()
+            stop = rows + len(values)
+            labels[rows:stop] = values[:, 0]
+            images[rows:stop] = values[:, 1:].reshape((-1,) + IMAGE_SHAPE)
+            rows = stop
+        images.flush()
+        if rows < n:
+            # Blank lines were counted but not parsed: keep only the rows that were read
+            with open(path + ".trim", "wb") as f:
+                np.save(f, images[:rows])
+            del images
+            os.replace(path + ".trim", path)
+
+    def write_labels(path):
+        with open(path, "wb") as f:
+            np.save(f, labels[:rows])
+
+    _write_atomic(images_path, write_images)
+    _write_atomic(labels_path, write_labels)
+
+
+def load_split(split, directory=".", cache_dir=None):
+    """
+    Return (images, labels) of the "train" or "test" split as uint8 arrays.
+
+    The CSV is converted on first use (or when it is newer than the .npy
+    files, which are written to cache_dir, by default next to the CSV);
+    after that the images are memory-mapped read-only.
+    """
+    csv_path = os.path.join(directory, CSV_FILES[split])
+    cache_dir = cache_dir or directory
+    images_path, labels_path = _npy_paths(csv_path, cache_dir)
+
+    stale = not (os.path.exists(images_path) and os.path.exists(labels_path))
+    if not stale and os.path.exists(csv_path):
+        stale = os.path.getmtime(csv_path) > min(os.path.getmtime(images_path),
+                                                 os.path.getmtime(labels_path))
+    if stale:
+        os.makedirs(cache_dir, exist_ok=True)
+        convert_csv(csv_path, images_path, labels_path)
+
+    return np.load(images_path, mmap_mode="r"), np.load(labels_path)
+
+
+def train_validation_indices(n, validation_size=0.2, seed=12345):
+    """Shuffle range(n) and split it into (train, validation) index arrays."""
+    order = np.random.default_rng(seed).permutation(n)
+    n_validation = int(math.ceil(n * validation_size))
+    return order[n_validation:], order[:n_validation]
+
+
+class Batches:
+    """
+    Normalized float32 mini-batches of a split, read from the uint8 arrays on demand.
+
+    indices selects the rows (e.g. from train_validation_indices) without copying
+    them; shuffle reorders them at the start of every epoch. Indexable and
+    iterable, yielding (images / 255, labels) pairs.
+    """
+
+    def __init__(self, images, labels, indices=None, batch_size=512, shuffle=False, seed=None):
+        self.images = images
+        self.labels = labels
+        self.indices = indices
+        self.batch_size = batch_size
+        self.shuffle = shuffle
+        self._rng = np.random.default_rng(seed)
+        self._order = None
+        self.on_epoch_end()
+
+    def __len__(self):
+        return math.ceil(self.size / self.batch_size)
+
+    @property
+    def size(self):
+        return len(self.labels) if self.indices is None else len(self.indices)
+
+    def on_epoch_end(self):
+        if self.shuffle:
+            order = np.arange(self.size) if self.indices is None else self.indices
+            self._order = self._rng.permutation(order)
+        else:
+            self._order = self.indices
+
+    def __getitem__(self, number):
+        if not 0 <= number < len(self):
+            raise IndexError(number)
+        start, stop = number * self.batch_size, (number + 1) * self.batch_size
+        if self._order is None:
+            # Unshuffled full split: a slice of the memory map, no fancy indexing
+            images, labels = self.images[start:stop], self.labels[start:stop]
+        else:
+            rows = self._order[start:stop]
+            if self.shuffle:
+                # Order within a shuffled batch is arbitrary; sorted rows read the memory map front to back
+                rows = np.sort(rows)
+            images, labels = self.images[rows], self.labels[rows]
+        batch = images.astype(np.float32)
+        batch *= 1 / 255
+        return batch, labels
+
+    def __iter__(self):
+        for number in range(len(self)):
+            yield self[number]
+        self.on_epoch_end()
+
+
+def keras_batches(batches):
+    """Wrap Batches in the Keras dataset type so model.fit/evaluate/predict accept it."""
+    from tensorflow import keras
+
+    base = getattr(keras.utils, "PyDataset", None) or keras.utils.Sequence
+
+    class KerasBatches(base):
+        def __init__(self):
+            super().__init__()
+
+        def __len__(self):
+            return len(batches)
+
+        def __getitem__(self, number):
+            return batches[number]
+
+        def on_epoch_end(self):
+            batches.on_epoch_end()
+
+    return KerasBatches()
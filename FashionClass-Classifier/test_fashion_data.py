@@ -0,0 +1,50 @@
+import numpy as np
+import pytest
+
+import fashion_data
+
+HEADER = "label," + ",".join(f"pixel{i}" for i in range(1, 785))
+
+
+@pytest.fixture
+def rows():
+    rng = np.random.default_rng(0)
+    return np.column_stack([rng.integers(0, 10, 50), rng.integers(0, 256, (50, 784))])
+
+
+def write_csv(directory, rows, ending):
+    text = HEADER + "\n" + "\n".join(",".join(map(str, row)) for row in rows) + ending
+    (directory / fashion_data.CSV_FILES["train"]).write_text(text)
+
+
+@pytest.mark.parametrize("ending", ["", "\n", "\n\n", "\n\n\n"])
+def test_load_split_with_or_without_trailing_newlines(tmp_path, rows, ending):
+    write_csv(tmp_path, rows, ending)
+
+    images, labels = fashion_data.load_split("train", str(tmp_path))
+
+    assert images.shape == (len(rows),) + fashion_data.IMAGE_SHAPE
+    np.testing.assert_array_equal(labels, rows[:, 0])
+    np.testing.assert_array_equal(images.reshape(len(rows), -1), rows[:, 1:])
+
+
+def test_load_split_reuses_converted_files(tmp_path, rows):
+    write_csv(tmp_path, rows, "\n")
+    fashion_data.load_split("train", str(tmp_path))
+
+    images, _ = fashion_data.load_split("train", str(tmp_path))
+
+    assert isinstance(images, np.memmap)
+    assert sorted(path.suffix for path in tmp_path.iterdir()) == [".csv", ".npy", ".npy"]
+
+
+def test_batches_scale_to_unit_range(tmp_path, rows):
+    write_csv(tmp_path, rows, "\n")
+    images, labels = fashion_data.load_split("train", str(tmp_path))
+    train, validation = fashion_data.train_validation_indices(len(labels))
+
+    batch, batch_labels = fashion_data.Batches(images, labels, validation, batch_size=8)[0]
+
+    assert batch.dtype == np.float32
+    np.testing.assert_allclose(batch, images[validation[:8]] / 255)
+    np.testing.assert_array_equal(batch_labels, labels[validation[:8]])
@@ -0,0 +1,201 @@
+"""
+Bulk scoring of student files with the placement model.
+
+The input CSV is read in fixed-size chunks, each chunk is scored with one
+vectorized ScratchLinearRegression.predict call, and the results are
+appended to the output file before the next chunk is read. Memory therefore
+stays bounded by the chunk size however many rows the file has.
+
+Usage:
+    python batch_scoring.py students.csv predictions.csv
+"""
+
+import argparse
+import os
+
+PREDICTION_COLUMN = 'predicted_package'
+
+OUTPUT_FORMATS = ('csv', 'parquet')
+
+
+def _input_size(source):
+    """
+    Total size in bytes of a path or seekable file object, or None.
+    """
+    if isinstance(source, (str, os.PathLike)):
+        return os.path.getsize(source)
+    try:
+        position = source.tell()
+        size = source.seek(0, os.SEEK_END)
+        source.seek(position)
+        return size
+    except (AttributeError, OSError):
+        return None
+
+
+def _read_chunks(handle, chunksize, dtype=None):
+    """
+    Iterate over the CSV in DataFrame chunks; a file without even a header yields nothing.
+    """
+    import pandas as pd
+
+    try:
+        yield from pd.read_csv(handle, chunksize=chunksize, dtype=dtype)
+    except pd.errors.EmptyDataError:
+        return
+
+
+def _column_kind(series):
+    from pandas.api import types
+
+    if series.isna().all():
+        # No values in this chunk, so no evidence for the column's type
+        return None
+    if types.is_bool_dtype(series):
+        return 'bool'
+    if types.is_integer_dtype(series):
+        return 'int64'
+    if types.is_float_dtype(series):
+        return 'float64'
+    return 'str'
+
+
+def _column_dtypes(handle, chunksize):
+    """
+    Scan the whole CSV once and choose a dtype per column that fits every chunk.
+
+    Integers widen to floats when any chunk has decimals or missing values,
+    other mixtures become strings, and columns that are empty throughout are
+    floats.
+
+    Returns:
+    dict: Column name mapped to a dtype accepted by pandas.read_csv
+    """
+    kinds = {}
+    for chunk in _read_chunks(handle, chunksize):
+        for name, series in chunk.items():
+            kind, previous = _column_kind(series), kinds.get(name)
+            if previous is None:
+                kinds[name] = kind
+            elif kind is not None and kind != previous:
+                kinds[name] = 'float64' if {kind, previous} == {'int64', 'float64'} else 'str'
+    return {name: kind or 'float64' for name, kind in kinds.items()}
+
+
+def score_csv(source, destination, model, column='cgpa', output_format='csv',
+              chunksize=100_000, progress=None):
+    """
+    Score every row of a CSV file and write the predictions to a new file.
+
+    All input columns are kept and a predicted_package column is appended.
+    Rows whose score is missing or not numeric get an empty prediction. The
+    destination is always written, with just the header (or an empty table)
+    when the input has no rows.
+
+    Parquet files need one schema up front, so for parquet output the input
+    is first scanned once to fix every column's type; file objects must then
+    be seekable.
+
+    Parameters:
+    source (str or file-like): CSV to score
+    destination (str): Path of the output file
+    model (ScratchLinearRegression): Trained model
+    column (str): Name of the column holding the academic scores
+    output_format (str): 'csv' or 'parquet' (requires pyarrow)
+    chunksize (int): Number of rows read and scored at a time
+    progress (callable, optional): Called after each chunk with the number of
+                                   rows scored so far and the fraction of the
+                                   input consumed (None if unknown)
+
+    Returns:
+    int: Number of rows scored
+
+    Raises:
+    ValueError: If the format is unknown or the score column is missing
+    """
+    import pandas as pd
+
+    if output_format not in OUTPUT_FORMATS:
+        raise ValueError(f"Unknown output format: {output_format}")
+
+    total_bytes = _input_size(source)
+    handle = open(source, 'rb') if isinstance(source, (str, os.PathLike)) else source
+    writer = None
+    schema = None
+    dtypes = None
+    rows = 0
+    written = False
+
+    try:
+        if output_format == 'parquet':
+            import pyarrow as pa
+            import pyarrow.parquet as pq
+
+            start = handle.tell()
+            dtypes = _column_dtypes(handle, chunksize) or {column: 'float64'}
+            handle.seek(start)
+            empty = pd.DataFrame({name: pd.Series(dtype=dtype) for name, dtype in dtypes.items()})
+            empty[PREDICTION_COLUMN] = pd.Series(dtype=float)
+            schema = pa.Schema.from_pandas(empty, preserve_index=False)
+
+        for chunk in _read_chunks(handle, chunksize, dtypes):
+            if column not in chunk.columns:
+                raise ValueError(f"Input file has no '{column}' column.")
+
+            scores = pd.to_numeric(chunk[column], errors='coerce').to_numpy(dtype=float, copy=True)
+            chunk[PREDICTION_COLUMN] = model.predict(scores, out=scores)
+
+            if output_format == 'csv':
+                chunk.to_csv(destination, mode='a' if written else 'w',
+                             header=not written, index=False)
+            else:
+                if writer is None:
+                    writer = pq.ParquetWriter(destination, schema)
+                writer.write_table(pa.Table.from_pandas(chunk, schema=schema, preserve_index=False))
+            written = True
+
+            rows += len(chunk)
+            if progress is not None:
+                fraction = None
+                if total_bytes:
+                    fraction = min(handle.tell() / total_bytes, 1.0)
+                progress(rows, fraction)
+
+        if not written:
+            # Empty input: still produce an output with the expected columns
+            if output_format == 'csv':
+                pd.DataFrame(columns=[column, PREDICTION_COLUMN]).to_csv(destination, index=False)
+            else:
+                pq.write_table(schema.empty_table(), destination)
+    finally:
+        if writer is not None:
+            writer.close()
+        if handle is not source:
+            handle.close()
+
+    return rows
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Score a CSV of students with the placement model.')
+    parser.add_argument('input', help='CSV to score')
+    parser.add_argument('output', help='Output file')
+    parser.add_argument('--format', choices=OUTPUT_FORMATS,
+                        help='Output format (default: from the output extension, else csv)')
+    parser.add_argument('--column', default='cgpa', help='Column holding the academic scores')
+    parser.add_argument('--csv', default='placement_extended.csv',
+                        help='Dataset the model is trained on (cached summary is reused)')
+    parser.add_argument('--chunksize', type=int, default=100_000)
+    args = parser.parse_args()
+
+    from summary import load_summary
+
+    output_format = args.format or ('parquet' if args.output.endswith('.parquet') else 'csv')
+    model, _ = load_summary(args.csv)
+    rows = score_csv(args.input, args.output, model, column=args.column,
+                     output_format=output_format, chunksize=args.chunksize)
+    print(f"Scored {rows:,} rows to {args.output}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,278 @@
+"""
+Benchmark and profiling harness for the regression model and the placement
+dashboard pipeline.
+
+Times ScratchLinearRegression.fit, predict and calculate_r_squared over a
+range of dataset sizes, dtypes and input containers, and every stage of the
+Streamlit app (CSV and cached data loading, training, figure rendering,
+metrics) headlessly against placement_extended.csv and synthetic scaled
+copies of it. Peak memory of every measurement is tracked with tracemalloc
+in one extra run, separate from the timed runs, and all results are written
+to JSON so runs from different commits can be compared.
+
+Usage:
+    python benchmark.py --output results.json
+    python benchmark.py --sizes 1000 100000 --compare results.json
+"""
+
+import argparse
+import json
+import os
+import platform
+import subprocess
+import tempfile
+import time
+import tracemalloc
+from datetime import datetime, timezone
+
+import numpy as np
+
+from data_cache import load_frame
+from model import ScratchLinearRegression
+from plotting import DashboardFigure, compute_density, compute_histogram
+
+DEFAULT_SIZES = [10 ** power for power in range(3, 9)]
+
+
+def measure(func, repeat=3):
+    """
+    Time a callable and record its peak traced memory.
+
+    tracemalloc slows allocation-heavy code down considerably, so the timed
+    runs are made with it off and the peak comes from one additional traced run.
+
+    Parameters:
+    func (callable): Zero-argument callable to measure
+    repeat (int): Number of timed runs; the best one is reported
+
+    Returns:
+    dict: Best and mean wall time in seconds and peak memory in bytes
+    """
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        timings.append(time.perf_counter() - start)
+
+    tracemalloc.start()
+    try:
+        func()
+        peak = tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+    return {
+        'best_s': min(timings),
+        'mean_s': sum(timings) / len(timings),
+        'peak_bytes': peak
+    }
+
+
+def synthetic_data(n, dtype, seed=0):
+    """
+    Generate a synthetic cgpa/package dataset shaped like the real one.
+
+    Parameters:
+    n (int): Number of rows
+    dtype (str): Floating dtype of the generated columns
+    seed (int): Random seed
+
+    Returns:
+    tuple: (cgpa, package) arrays
+    """
+    rng = np.random.default_rng(seed)
+    cgpa = rng.uniform(4.0, 10.0, n).astype(dtype)
+    package = (0.57 * cgpa - 0.98 + rng.normal(0.0, 0.2, n)).astype(dtype)
+    return cgpa, package
+
+
+def bench_model(sizes, dtypes, containers, max_list_rows, repeat):
+    """
+    Benchmark the model methods across sizes, dtypes and input containers.
+
+    Returns:
+    list: One result record per (method, size, dtype, container)
+    """
+    results = []
+    for n in sizes:
+        for dtype in dtypes:
+            X, y = synthetic_data(n, dtype)
+
+            for container in containers:
+                if container == 'list':
+                    if n > max_list_rows:
+                        continue
+                    X_in, y_in = X.tolist(), y.tolist()
+                else:
+                    X_in, y_in = X, y
+
+                model = ScratchLinearRegression()
+                model.fit(X_in, y_in)
+                cases = {
+                    'fit': lambda: ScratchLinearRegression().fit(X_in, y_in),
+                    'predict': lambda: model.predict(X_in),
+                    'calculate_r_squared': lambda: model.calculate_r_squared(X_in, y_in)
+                }
+
+                for name, func in cases.items():
+                    record = {
+                        'benchmark': f'model.{name}',
+                        'rows': n,
+                        'dtype': dtype,
+                        'container': container
+                    }
+                    record.update(measure(func, repeat))
+                    results.append(record)
+                    print(f"{record['benchmark']:<28} rows={n:<10} {dtype:<8} {container:<8}"
+                          f"{record['best_s'] * 1e3:10.2f} ms {record['peak_bytes'] / 2 ** 20:10.1f} MiB")
+    return results
+
+
+def render_figure(model, histogram, density=None, points=None, cgpa_input=7.5):
+    """
+    Render the dashboard figure off-screen from scratch, as on the app's first run.
+    """
+    return DashboardFigure(model, histogram, density=density, points=points).render(cgpa_input)
+
+
+def bench_app(csv_path, scales, repeat):
+    """
+    Benchmark each stage of the dashboard pipeline headlessly.
+
+    Scale 1 uses the CSV itself; larger scales use temporary CSVs made of
+    repeated, jittered copies of its rows.
+
+    Returns:
+    list: One result record per (stage, scale)
+    """
+    import pandas as pd
+
+    base = pd.read_csv(csv_path)
+    rng = np.random.default_rng(0)
+    results = []
+
+    with tempfile.TemporaryDirectory() as tmp:
+        for scale in scales:
+            path = csv_path
+            if scale != 1:
+                scaled = pd.concat([base] * scale, ignore_index=True)
+                scaled['cgpa'] = (scaled['cgpa'] + rng.normal(0.0, 0.01, len(scaled))).round(2)
+                path = os.path.join(tmp, f'placement_x{scale}.csv')
+                scaled.to_csv(path, index=False)
+                del scaled
+
+            df = pd.read_csv(path)
+            model = ScratchLinearRegression()
+            model.fit(df['cgpa'].values, df['package'].values)
+            density = compute_density(df['cgpa'].values, df['package'].values)
+            histogram = compute_histogram(df['package'].values)
+            cached_figure = DashboardFigure(model, histogram, density=density)
+
+            stages = {
+                'load_data': lambda: pd.read_csv(path),
+                'load_data_cached': lambda: load_frame(path),
+                'train_model': lambda: ScratchLinearRegression().fit(df['cgpa'].values,
+                                                                     df['package'].values),
+                'plot_layers': lambda: (compute_density(df['cgpa'].values, df['package'].values),
+                                        compute_histogram(df['package'].values)),
+                'render_figure_density': lambda: render_figure(model, histogram, density=density),
+                'render_figure_scatter': lambda: render_figure(model, histogram,
+                                                               points=(df['cgpa'], df['package'])),
+                # Later reruns: only the line and analysis point over the cached layers
+                'render_rerun': lambda: cached_figure.render(8.1),
+                'metrics': lambda: model.evaluate(df['cgpa'].values, df['package'].values)
+            }
+
+            for name, func in stages.items():
+                record = {'benchmark': f'app.{name}', 'rows': len(df), 'scale': scale}
+                record.update(measure(func, repeat))
+                results.append(record)
+                print(f"{record['benchmark']:<28} rows={len(df):<10} x{scale:<15}"
+                      f"{record['best_s'] * 1e3:10.2f} ms {record['peak_bytes'] / 2 ** 20:10.1f} MiB")
+    return results
+
+
+def environment():
+    """
+    Describe the machine and code revision the benchmark ran on.
+    """
+    try:
+        commit = subprocess.run(['git', 'rev-parse', 'HEAD'], capture_output=True,
+                                text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        commit = None
+
+    return {
+        'timestamp': datetime.now(timezone.utc).isoformat(),
+        'commit': commit,
+        'python': platform.python_version(),
+        'numpy': np.__version__,
+        'platform': platform.platform(),
+        'cpu_count': os.cpu_count()
+    }
+
+
+def result_key(record):
+    """
+    Identify a benchmark record independently of its measurements.
+    """
+    return tuple(sorted((k, v) for k, v in record.items()
+                        if k not in ('best_s', 'mean_s', 'peak_bytes')))
+
+
+def compare(results, baseline_path):
+    """
+    Print the time and memory ratio of every result against a baseline run.
+    """
+    with open(baseline_path) as f:
+        baseline = {result_key(r): r for r in json.load(f)['results']}
+
+    print(f"\nComparison against {baseline_path} (ratio current / baseline):")
+    for record in results:
+        previous = baseline.get(result_key(record))
+        if previous is None:
+            continue
+        time_ratio = record['best_s'] / previous['best_s'] if previous['best_s'] else float('nan')
+        memory_ratio = (record['peak_bytes'] / previous['peak_bytes']
+                        if previous['peak_bytes'] else float('nan'))
+        label = ' '.join(f'{k}={v}' for k, v in result_key(record))
+        print(f"  {label:<80} time x{time_ratio:6.2f}  memory x{memory_ratio:6.2f}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--sizes', type=int, nargs='+', default=DEFAULT_SIZES,
+                        help='Row counts for the model benchmarks')
+    parser.add_argument('--dtypes', nargs='+', default=['float32', 'float64'])
+    parser.add_argument('--containers', nargs='+', default=['ndarray', 'list'],
+                        choices=['ndarray', 'list'])
+    parser.add_argument('--max-list-rows', type=int, default=10 ** 6,
+                        help='Skip list inputs above this size')
+    parser.add_argument('--csv', default='placement_extended.csv',
+                        help='Dataset used for the app pipeline benchmarks')
+    parser.add_argument('--scales', type=int, nargs='+', default=[1, 5],
+                        help='Replication factors of the CSV for the app benchmarks')
+    parser.add_argument('--repeat', type=int, default=3)
+    parser.add_argument('--skip-model', action='store_true')
+    parser.add_argument('--skip-app', action='store_true')
+    parser.add_argument('--output', default='benchmark_results.json')
+    parser.add_argument('--compare', help='Previous JSON output to compare against')
+    args = parser.parse_args()
+
+    results = []
+    if not args.skip_model:
+        results += bench_model(args.sizes, args.dtypes, args.containers,
+                               args.max_list_rows, args.repeat)
+    if not args.skip_app:
+        results += bench_app(args.csv, args.scales, args.repeat)
+
+    with open(args.output, 'w') as f:
+        json.dump({'environment': environment(), 'results': results}, f, indent=2)
+    print(f"\nWrote {len(results)} results to {args.output}")
+
+    if args.compare:
+        compare(results, args.compare)
+
+
+if __name__ == '__main__':
+    main()
@@ -5,8 +5,19 @@ class ScratchLinearRegression:
     A custom implementation of linear regression using ordinary least squares method.
     This class provides fundamental linear regression capabilities for educational
     and analytical purposes.
+    
+    Training keeps running sufficient statistics (count, means and co-moments)
+    rather than the data itself, so models can be trained incrementally with
+    partial_fit and models trained on separate shards can be merged.
     """
     
+    # Number of observations processed per step when reducing large inputs
+    chunk_size = 65536
+    
+    # Metrics supported by evaluate, and those available from the statistics alone
+    METRICS = ('mse', 'rmse', 'mae', 'r_squared')
+    STATISTICS_METRICS = ('mse', 'rmse', 'r_squared')
+    
     def __init__(self):
         """
         Initialize the linear regression model.
@@ -17,6 +28,100 @@ class ScratchLinearRegression:
         """
         self.m = None
         self.b = None
+        self._reset_statistics()
+        
+    def _reset_statistics(self):
+        """
+        Clear the running sufficient statistics.
+        
+        Attributes:
+        n (int): Number of observations seen so far
+        x_mean (float): Running mean of the independent variable
+        y_mean (float): Running mean of the dependent variable
+        sxx (float): Sum of squared deviations of X from its mean
+        sxy (float): Sum of cross deviations of X and y from their means
+        syy (float): Sum of squared deviations of y from its mean
+        """
+        self.n = 0
+        self.x_mean = 0.0
+        self.y_mean = 0.0
+        self.sxx = 0.0
+        self.sxy = 0.0
+        self.syy = 0.0
+        
+    @staticmethod
+    def _chunk_statistics(X, y):
+        """
+        Compute the sufficient statistics of a single chunk of observations.
+        
+        Parameters:
+        X (ndarray): Independent variable values of the chunk
+        y (ndarray): Dependent variable values of the chunk
+        
+        Returns:
+        tuple: (n, x_mean, y_mean, sxx, sxy, syy) for the chunk
+        """
+        X = np.asarray(X, dtype=float).ravel()
+        y = np.asarray(y, dtype=float).ravel()
+        
+        if X.shape != y.shape:
+            raise ValueError("X and y must contain the same number of observations.")
+        
+        n = X.size
+        if n == 0:
+            return 0, 0.0, 0.0, 0.0, 0.0, 0.0
+        
+        x_mean = X.mean()
+        y_mean = y.mean()
+        
+        # Deviations are only ever chunk-sized temporaries
+        dx = X - x_mean
+        dy = y - y_mean
+        
+        return n, float(x_mean), float(y_mean), float(dx @ dx), float(dx @ dy), float(dy @ dy)
+        
+    def _merge_statistics(self, n, x_mean, y_mean, sxx, sxy, syy):
+        """
+        Combine another set of sufficient statistics into the running state
+        using the pairwise update of Chan, Golub and LeVeque.
+        
+        Parameters:
+        n (int): Number of observations in the other set
+        x_mean, y_mean (float): Means of the other set
+        sxx, sxy, syy (float): Co-moments of the other set
+        """
+        if n == 0:
+            return
+        if self.n == 0:
+            self.n, self.x_mean, self.y_mean = n, x_mean, y_mean
+            self.sxx, self.sxy, self.syy = sxx, sxy, syy
+            return
+        
+        total = self.n + n
+        delta_x = x_mean - self.x_mean
+        delta_y = y_mean - self.y_mean
+        weight = self.n * n / total
+        
+        self.x_mean += delta_x * n / total
+        self.y_mean += delta_y * n / total
+        self.sxx += sxx + delta_x * delta_x * weight
+        self.sxy += sxy + delta_x * delta_y * weight
+        self.syy += syy + delta_y * delta_y * weight
+        self.n = total
+        
+    def _update_coefficients(self):
+        """
+        Derive slope and intercept from the running sufficient statistics.
+        
+        Raises:
+        ValueError: If the variance of the independent variable is zero
+        """
+        if self.sxx == 0:
+            raise ValueError("Cannot compute regression coefficients: "
+                           "Variance in independent variable is zero.")
+        
+        self.m = self.sxy / self.sxx
+        self.b = self.y_mean - self.m * self.x_mean
         
     def fit(self, X, y):
         """
@@ -29,46 +134,132 @@ class ScratchLinearRegression:
         Raises:
         ValueError: If the denominator in slope calculation is zero
         """
-        # Convert inputs to numpy arrays with explicit float typing
-        X = np.array(X, dtype=float)
-        y = np.array(y, dtype=float)
+        # Views only; chunks are converted to float one at a time
+        X = np.asarray(X).ravel()
+        y = np.asarray(y).ravel()
         
-        # Calculate central tendencies
-        X_mean = np.mean(X)
-        y_mean = np.mean(y)
+        if X.shape != y.shape:
+            raise ValueError("X and y must contain the same number of observations.")
         
-        # Compute regression coefficients using OLS method
-        numerator = np.sum((X - X_mean) * (y - y_mean))
-        denominator = np.sum((X - X_mean) ** 2)
+        # Accumulate statistics chunk by chunk so peak memory stays bounded
+        self._reset_statistics()
+        for start in range(0, X.size, self.chunk_size):
+            stop = start + self.chunk_size
+            self._merge_statistics(*self._chunk_statistics(X[start:stop], y[start:stop]))
         
-        # Validate calculation conditions
-        if denominator == 0:
-            raise ValueError("Cannot compute regression coefficients: "
-                           "Variance in independent variable is zero.")
-            
-        self.m = numerator / denominator
-        self.b = y_mean - self.m * X_mean
+        self._update_coefficients()
+        
+    def partial_fit(self, X, y):
+        """
+        Incrementally train the model on one chunk of the dataset.
+        
+        Statistics from earlier calls are kept, so feeding a dataset through
+        partial_fit chunk by chunk yields the same coefficients as a single
+        call to fit on the whole dataset. Coefficients are refreshed as soon
+        as the independent variable shows any variance.
+        
+        Parameters:
+        X (array-like): Independent variable values of the chunk
+        y (array-like): Dependent variable values of the chunk
+        
+        Returns:
+        ScratchLinearRegression: The model itself, to allow chaining
+        """
+        self._merge_statistics(*self._chunk_statistics(X, y))
+        
+        if self.sxx > 0:
+            self._update_coefficients()
+        return self
         
-    def predict(self, X):
+    def merge(self, other):
+        """
+        Merge the statistics of another model, e.g. one fitted on a separate
+        shard in another process, into this model.
+        
+        Parameters:
+        other (ScratchLinearRegression): Model fitted on a disjoint part of the data
+        
+        Returns:
+        ScratchLinearRegression: The model itself, to allow chaining
+        """
+        self._merge_statistics(other.n, other.x_mean, other.y_mean,
+                               other.sxx, other.sxy, other.syy)
+        
+        if self.sxx > 0:
+            self._update_coefficients()
+        return self
+        
+    def predict(self, X, out=None, dtype=None):
         """
         Generate predictions using the trained regression model.
         
+        The input is used as-is when it already is an array (including
+        np.memmap and other buffer-protocol objects), so no copy is made.
+        Predictions are written block by block into a single output array;
+        passing an np.memmap as out scores arrays larger than memory.
+        
         Parameters:
         X (array-like or scalar): Input values for prediction
+        out (ndarray, optional): Buffer with the shape of X receiving the predictions
+        dtype (dtype, optional): Output dtype; defaults to the dtype of out, else
+                                 to the floating dtype of X (float32 stays float32),
+                                 else float64
         
         Returns:
         array or scalar: Predicted values based on the regression model
         
         Raises:
-        ValueError: If the model has not been trained
+        ValueError: If the model has not been trained or out has the wrong shape
         """
         if self.m is None or self.b is None:
             raise ValueError("Model must be trained before generating predictions.")
         
-        # Ensure input is properly formatted
-        X = np.array(X, dtype=float)
-            
-        return self.m * X + self.b
+        # View the input without copying it
+        X = np.asarray(X)
+        
+        if out is None:
+            if dtype is None:
+                dtype = X.dtype if X.dtype.kind == 'f' else np.float64
+            out = np.empty(X.shape, dtype=dtype)
+        elif out.shape != X.shape:
+            raise ValueError(f"Output buffer has shape {out.shape}, expected {X.shape}.")
+        
+        if X.ndim == 0:
+            out[()] = self.m * X + self.b
+            return out[()]
+        
+        # Python floats keep float32 inputs computing in float32
+        m, b = float(self.m), float(self.b)
+        for start in range(0, X.shape[0], self.chunk_size):
+            block = out[start:start + self.chunk_size]
+            np.multiply(X[start:start + self.chunk_size], m, out=block)
+            np.add(block, b, out=block)
+        
+        return out
+    
+    def predict_file(self, source, destination, dtype=None):
+        """
+        Score a .npy file of arbitrary size into another .npy file.
+        
+        Both files are memory-mapped and processed in fixed-size blocks,
+        so memory use does not depend on the file size.
+        
+        Parameters:
+        source (str): Path of the .npy file holding the input values
+        destination (str): Path of the .npy file to write predictions to
+        dtype (dtype, optional): Output dtype, as in predict
+        
+        Returns:
+        np.memmap: The memory-mapped predictions
+        """
+        X = np.load(source, mmap_mode='r')
+        if dtype is None:
+            dtype = X.dtype if X.dtype.kind == 'f' else np.float64
+        
+        out = np.lib.format.open_memmap(destination, mode='w+', dtype=dtype, shape=X.shape)
+        self.predict(X, out=out)
+        out.flush()
+        return out
     
     def get_parameters(self):
         """
@@ -82,6 +273,45 @@ class ScratchLinearRegression:
             'intercept_term': self.b
         }
     
+    def get_statistics(self):
+        """
+        Retrieve the running sufficient statistics of the model.
+        
+        The returned dictionary is plain Python data, so it can be sent
+        between processes or stored and later restored with from_statistics.
+        
+        Returns:
+        dict: Observation count, means and co-moments
+        """
+        return {
+            'n': self.n,
+            'x_mean': self.x_mean,
+            'y_mean': self.y_mean,
+            'sxx': self.sxx,
+            'sxy': self.sxy,
+            'syy': self.syy
+        }
+    
+    @classmethod
+    def from_statistics(cls, statistics):
+        """
+        Build a model from sufficient statistics produced by get_statistics.
+        
+        Parameters:
+        statistics (dict): Observation count, means and co-moments
+        
+        Returns:
+        ScratchLinearRegression: Model with coefficients derived from the statistics
+        """
+        model = cls()
+        model._merge_statistics(int(statistics['n']), float(statistics['x_mean']),
+                                float(statistics['y_mean']), float(statistics['sxx']),
+                                float(statistics['sxy']), float(statistics['syy']))
+        
+        if model.sxx > 0:
+            model._update_coefficients()
+        return model
+    
     def calculate_r_squared(self, X, y):
         """
         Compute the coefficient of determination (R-squared) for model evaluation.
@@ -93,20 +323,287 @@ class ScratchLinearRegression:
         Returns:
         float: R-squared value indicating model explanatory power
         """
-        # Convert inputs to appropriate format
-        X = np.array(X, dtype=float)
-        y = np.array(y, dtype=float)
+        return self.evaluate(X, y, metrics=('r_squared',))['r_squared']
+    
+    def evaluate(self, X=None, y=None, metrics=None):
+        """
+        Compute several evaluation metrics in one fused pass over the data.
+        
+        The data is processed in chunks of chunk_size, so only chunk-sized
+        residual arrays are ever allocated. When X and y are omitted the
+        metrics are derived from the fitted sufficient statistics without
+        touching the raw data; MAE is not available in that mode.
+        
+        Parameters:
+        X (array-like, optional): Independent variable values
+        y (array-like, optional): Actual target values
+        metrics (iterable, optional): Names of the metrics to compute, any of
+                                      'mse', 'rmse', 'mae' and 'r_squared';
+                                      defaults to all of them, or all but
+                                      'mae' without X and y
+        
+        Returns:
+        dict: Metric name mapped to its value
+        
+        Raises:
+        ValueError: If the model is untrained, a metric is unknown or the
+                    requested metrics cannot be computed from the inputs
+        """
+        if self.m is None or self.b is None:
+            raise ValueError("Model must be trained before evaluation.")
+        
+        if metrics is None:
+            metrics = self.STATISTICS_METRICS if X is None and y is None else self.METRICS
+        metrics = tuple(metrics)
+        unknown = [name for name in metrics if name not in self.METRICS]
+        if unknown:
+            raise ValueError(f"Unknown metric(s): {', '.join(unknown)}")
+        
+        if X is None and y is None:
+            if 'mae' in metrics:
+                raise ValueError("Mean absolute error requires the raw data.")
+            n, sse, sae, syy = self._residuals_from_statistics()
+        else:
+            n, sse, sae, syy = self._residuals_from_data(X, y, 'mae' in metrics)
+        
+        if n == 0:
+            raise ValueError("Cannot evaluate the model on an empty dataset.")
+        
+        results = {
+            'mse': sse / n,
+            'rmse': np.sqrt(sse / n),
+            'mae': sae / n,
+            'r_squared': 1 - (sse / syy) if syy != 0 else 0.0
+        }
+        return {name: float(results[name]) for name in metrics}
+    
+    def _residuals_from_statistics(self):
+        """
+        Derive residual sums of the current coefficients from the fitted
+        sufficient statistics.
+        
+        Returns:
+        tuple: (n, sum of squared residuals, NaN, total sum of squares)
+        """
+        offset = self.y_mean - self.m * self.x_mean - self.b
+        sse = (self.syy - 2 * self.m * self.sxy + self.m * self.m * self.sxx
+               + self.n * offset * offset)
+        
+        return self.n, max(sse, 0.0), float('nan'), self.syy
+    
+    def _residuals_from_data(self, X, y, absolute):
+        """
+        Accumulate residual sums chunk by chunk over the raw data.
+        
+        Parameters:
+        X (array-like): Independent variable values
+        y (array-like): Actual target values
+        absolute (bool): Whether to also accumulate absolute residuals
+        
+        Returns:
+        tuple: (n, sum of squared residuals, sum of absolute residuals,
+                total sum of squares)
+        """
+        X = np.asarray(X).ravel()
+        y = np.asarray(y).ravel()
         
-        # Generate predictions
-        y_pred = self.predict(X)
-        y_mean = np.mean(y)
+        if X.shape != y.shape:
+            raise ValueError("X and y must contain the same number of observations.")
         
-        # Calculate sum of squares
-        ss_residual = np.sum((y - y_pred) ** 2)
-        ss_total = np.sum((y - y_mean) ** 2)
+        n, y_mean, syy = 0, 0.0, 0.0
+        sse, sae = 0.0, 0.0
         
-        # Handle edge case
-        if ss_total == 0:
-            return 0.0
+        for start in range(0, X.size, self.chunk_size):
+            y_chunk = np.asarray(y[start:start + self.chunk_size], dtype=float)
             
-        return 1 - (ss_residual / ss_total)
\ No newline at end of file
+            # Residuals are computed in place in a single chunk-sized buffer
+            residual = np.multiply(X[start:start + self.chunk_size], self.m, dtype=float)
+            residual += self.b
+            np.subtract(y_chunk, residual, out=residual)
+            
+            sse += float(residual @ residual)
+            if absolute:
+                sae += float(np.abs(residual, out=residual).sum())
+            
+            # Merge the chunk's total sum of squares into the running one
+            count = y_chunk.size
+            chunk_mean = y_chunk.mean()
+            deviation = y_chunk - chunk_mean
+            total = n + count
+            delta = chunk_mean - y_mean
+            syy += float(deviation @ deviation) + delta * delta * n * count / total
+            y_mean += delta * count / total
+            n = total
+        
+        return n, sse, sae, syy
+
+class GroupedLinearRegression:
+    """
+    Fit an independent simple linear regression for every group of a dataset
+    in a single vectorized pass.
+    
+    Rows are assigned to groups through a key array (e.g. college, year or
+    branch). Per-group counts, means and co-moments are computed with
+    segmented reductions (np.bincount) instead of one ScratchLinearRegression
+    fit per group, so thousands of groups cost about as much as one full fit.
+    """
+    
+    def __init__(self):
+        """
+        Initialize the grouped regression model.
+        
+        Attributes:
+        groups (ndarray): Sorted unique group keys seen during training
+        m (ndarray): Slope coefficient per group
+        b (ndarray): Intercept term per group
+        n (ndarray): Number of observations per group
+        """
+        self.groups = None
+        self.m = None
+        self.b = None
+        self.n = None
+        
+    def fit(self, X, y, groups):
+        """
+        Train one regression line per group.
+        
+        Groups whose independent variable has no variance cannot be fitted;
+        their slope and intercept are set to NaN instead of failing the
+        whole batch.
+        
+        Parameters:
+        X (array-like): Independent variable values (feature)
+        y (array-like): Dependent variable values (target)
+        groups (array-like): Group key of every observation
+        
+        Returns:
+        GroupedLinearRegression: The model itself, to allow chaining
+        """
+        X = np.asarray(X, dtype=float).ravel()
+        y = np.asarray(y, dtype=float).ravel()
+        groups = np.asarray(groups).ravel()
+        
+        if not (X.shape == y.shape == groups.shape):
+            raise ValueError("X, y and groups must contain the same number of observations.")
+        
+        self.groups, codes = self._encode_groups(groups)
+        k = self.groups.size
+        
+        # Segmented raw moments, accumulated chunk by chunk so that only
+        # chunk-sized temporaries are allocated. Values are taken relative to
+        # the overall means to keep the raw sums from cancelling.
+        x_shift = X.mean() if X.size else 0.0
+        y_shift = y.mean() if y.size else 0.0
+        chunk_size = ScratchLinearRegression.chunk_size
+        n = np.zeros(k, dtype=np.int64)
+        sx, sy, sxx, sxy = (np.zeros(k) for _ in range(4))
+        for start in range(0, X.size, chunk_size):
+            stop = start + chunk_size
+            chunk_codes = codes[start:stop]
+            dx = X[start:stop] - x_shift
+            dy = y[start:stop] - y_shift
+            n += np.bincount(chunk_codes, minlength=k)
+            sx += np.bincount(chunk_codes, weights=dx, minlength=k)
+            sy += np.bincount(chunk_codes, weights=dy, minlength=k)
+            sxx += np.bincount(chunk_codes, weights=dx * dx, minlength=k)
+            sxy += np.bincount(chunk_codes, weights=dx * dy, minlength=k)
+        
+        # Co-moments around the per-group means
+        dx_mean = sx / n
+        dy_mean = sy / n
+        squares = sxx.copy()
+        sxx -= sx * dx_mean
+        sxy -= sx * dy_mean
+        x_mean = dx_mean + x_shift
+        y_mean = dy_mean + y_shift
+        
+        # A variance lost in rounding of the raw sums counts as no variance
+        fitted = sxx > squares * 1e-12
+        with np.errstate(divide='ignore', invalid='ignore'):
+            self.m = np.where(fitted, sxy / sxx, np.nan)
+        self.b = y_mean - self.m * x_mean
+        self.n = n
+        return self
+        
+    @staticmethod
+    def _encode_groups(groups):
+        """
+        Turn group keys into dense integer codes.
+        
+        Integer keys spanning a compact range (the usual case for ids and
+        years) are encoded in linear time with a lookup table; any other
+        keys fall back to the sort-based np.unique.
+        
+        Parameters:
+        groups (ndarray): Group key of every observation
+        
+        Returns:
+        tuple: (sorted unique keys, code of every observation)
+        """
+        if groups.dtype.kind in 'iu' and groups.size:
+            low, high = int(groups.min()), int(groups.max())
+            if high - low <= 4 * groups.size and high <= np.iinfo(np.int64).max:
+                # Offsets in int64: in a narrow key dtype (e.g. int8) groups - low can overflow
+                offsets = groups.astype(np.int64) - low
+                present = np.bincount(offsets, minlength=high - low + 1) > 0
+                lookup = np.cumsum(present) - 1
+                keys = (np.flatnonzero(present) + low).astype(groups.dtype)
+                return keys, lookup[offsets]
+        
+        return np.unique(groups, return_inverse=True)
+        
+    def _group_codes(self, groups):
+        """
+        Map group keys to positions in the fitted coefficient arrays.
+        
+        Parameters:
+        groups (array-like): Group keys to look up
+        
+        Returns:
+        ndarray: Index of each key in self.groups
+        
+        Raises:
+        ValueError: If a key was not seen during training
+        """
+        groups = np.asarray(groups)
+        codes = np.searchsorted(self.groups, groups)
+        codes = np.minimum(codes, self.groups.size - 1)
+        
+        unknown = self.groups[codes] != groups
+        if np.any(unknown):
+            raise ValueError(f"Unknown group key(s): {np.unique(groups[unknown])[:5].tolist()}")
+        return codes
+        
+    def predict(self, X, groups):
+        """
+        Generate predictions, using for every value the line of its group.
+        
+        Parameters:
+        X (array-like): Input values for prediction
+        groups (array-like): Group key of every input value
+        
+        Returns:
+        ndarray: Predicted values
+        
+        Raises:
+        ValueError: If the model has not been trained or a group is unknown
+        """
+        if self.groups is None:
+            raise ValueError("Model must be trained before generating predictions.")
+        
+        X = np.asarray(X, dtype=float)
+        codes = self._group_codes(groups)
+        
+        return self.m[codes] * X + self.b[codes]
+    
+    def get_parameters(self):
+        """
+        Retrieve the trained per-group parameters.
+        
+        Returns:
+        dict: Mapping of group key to slope and intercept parameters
+        """
+        return {
+            key: {'slope_coefficient': m, 'intercept_term': b}
+            for key, m, b in zip(self.groups.tolist(), self.m.tolist(), self.b.tolist())
+        }
@@ -0,0 +1,159 @@
+"""
+Figure rendering for the placement dashboard.
+
+The expensive, data-sized work (binning every observation into a 2D density
+grid and a package histogram) is split from drawing, and DashboardFigure
+renders those layers once into a pixel buffer. The app caches both per data
+version, so a rerun only redraws the regression line and analysis point over
+the buffer, whatever the number of observations.
+"""
+
+import threading
+
+import numpy as np
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+from matplotlib.colors import LogNorm
+from matplotlib.figure import Figure
+
+
+def compute_density(x, y, bins=200):
+    """
+    Bin observations into a 2D histogram grid.
+
+    Parameters:
+    x (array-like): Academic performance scores
+    y (array-like): Career outcome values
+    bins (int): Number of cells along each axis
+
+    Returns:
+    dict: Cell counts with their x and y edges
+    """
+    counts, x_edges, y_edges = np.histogram2d(np.asarray(x), np.asarray(y), bins=bins)
+    return {'counts': counts, 'x_edges': x_edges, 'y_edges': y_edges}
+
+
+def compute_histogram(values, bins=25):
+    """
+    Bin the career outcome values for the distribution panel.
+
+    Parameters:
+    values (array-like): Career outcome values
+    bins (int): Number of histogram bins
+
+    Returns:
+    dict: Bin counts, bin edges and the mean of the values
+    """
+    values = np.asarray(values)
+    counts, edges = np.histogram(values, bins=bins)
+    return {'counts': counts, 'edges': edges, 'mean': float(values.mean(dtype=float))}
+
+
+class DashboardFigure:
+    """
+    The two-panel dashboard figure with its static layers rendered once.
+
+    The relationship panel's density grid (or scatter), its colorbar, the
+    outcome histogram, titles and grid are drawn a single time and kept as a
+    pixel buffer. render() restores that buffer and draws only the regression
+    line, the analysis point and the legend on top, so a rerun costs a few
+    artists rather than a full figure. Instances are safe to share between
+    threads (e.g. Streamlit sessions via st.cache_resource).
+    """
+
+    def __init__(self, model, histogram, density=None, points=None, dpi=100):
+        """
+        Parameters:
+        model (ScratchLinearRegression): Trained model for the regression line
+        histogram (dict): Output of compute_histogram
+        density (dict, optional): Output of compute_density
+        points (tuple, optional): (x, y) arrays to scatter instead of the density
+        dpi (int): Resolution of the rendered image
+        """
+        self.model = model
+        self.fig = Figure(figsize=(16, 6), dpi=dpi)
+        self.canvas = FigureCanvasAgg(self.fig)
+        self.ax1, ax2 = self.fig.subplots(1, 2)
+        self._lock = threading.Lock()
+
+        if points is not None:
+            x, y = points
+            self.ax1.scatter(x, y, alpha=0.7, color='#3498db', s=50, label='Observations')
+            x_min, x_max = float(np.min(x)), float(np.max(x))
+        else:
+            counts = np.ma.masked_equal(density['counts'].T, 0)
+            x_edges, y_edges = density['x_edges'], density['y_edges']
+            image = self.ax1.imshow(counts, origin='lower', aspect='auto', cmap='Blues', norm=LogNorm(),
+                                    extent=(x_edges[0], x_edges[-1], y_edges[0], y_edges[-1]))
+            self.fig.colorbar(image, ax=self.ax1, label='Observations per cell')
+            x_min, x_max = float(x_edges[0]), float(x_edges[-1])
+
+        # Drawn per render, excluded from the cached background
+        x_range = np.linspace(x_min, x_max, 100)
+        self.line, = self.ax1.plot(x_range, model.predict(x_range), color='#e74c3c', linewidth=2.5,
+                                   label='Regression Line', animated=True)
+        self.point = self.ax1.scatter([], [], color='#2ecc71', s=150, zorder=5, edgecolors='black',
+                                      animated=True)
+        self.static_handles = [artist for artist in self.ax1.collections
+                               if not artist.get_label().startswith('_') and artist is not self.point]
+
+        self.ax1.set_xlabel('Academic Performance Score', fontsize=12)
+        self.ax1.set_ylabel('Career Outcome Metric', fontsize=12)
+        self.ax1.set_title('Relationship Analysis: Academic Performance vs Career Outcomes',
+                           fontsize=14, pad=20)
+        self.ax1.grid(True, alpha=0.2)
+
+        # Distribution analysis from the pre-binned counts
+        edges = histogram['edges']
+        ax2.hist(edges[:-1], bins=edges, weights=histogram['counts'], alpha=0.8, color='#9b59b6',
+                 edgecolor='white', linewidth=0.5)
+        ax2.axvline(histogram['mean'], color='#e74c3c', linestyle='--', linewidth=2,
+                    label=f"Mean: {histogram['mean']:.2f}")
+        ax2.set_xlabel('Career Outcome Metric', fontsize=12)
+        ax2.set_ylabel('Frequency', fontsize=12)
+        ax2.set_title('Distribution of Career Outcomes', fontsize=14, pad=20)
+        ax2.legend(loc='upper right')
+        ax2.grid(True, alpha=0.2)
+
+        self.fig.tight_layout()
+        self._draw_background()
+
+    def _draw_background(self):
+        self.canvas.draw()
+        self.background = self.canvas.copy_from_bbox(self.fig.bbox)
+
+    def _include(self, x, y):
+        # The background's axis limits are fixed; a point outside them needs a new background
+        (x_low, x_high), (y_low, y_high) = self.ax1.get_xlim(), self.ax1.get_ylim()
+        if x_low <= x <= x_high and y_low <= y <= y_high:
+            return
+        self.ax1.update_datalim([(x, y)])
+        self.ax1.autoscale_view()
+        self._draw_background()
+
+    def render(self, cgpa_input=None):
+        """
+        Draw the regression line and analysis point over the cached layers.
+
+        Parameters:
+        cgpa_input (float or None): Score highlighted as the analysis point
+
+        Returns:
+        ndarray: The figure as an RGBA image of shape (height, width, 4)
+        """
+        with self._lock:
+            handles = self.static_handles + [self.line]
+            if cgpa_input is not None:
+                pred_value = float(self.model.predict(cgpa_input))
+                self._include(cgpa_input, pred_value)
+                self.point.set_offsets([[cgpa_input, pred_value]])
+                self.point.set_label(f'Analysis Point (Score={cgpa_input})')
+                handles.append(self.point)
+
+            self.canvas.restore_region(self.background)
+            self.ax1.draw_artist(self.line)
+            if cgpa_input is not None:
+                self.ax1.draw_artist(self.point)
+            legend = self.ax1.legend(handles=handles, loc='upper left')
+            legend.set_animated(True)
+            self.ax1.draw_artist(legend)
+            return np.asarray(self.canvas.buffer_rgba()).copy()
@@ -0,0 +1,271 @@
+"""
+Headless JSON prediction service for the placement model.
+
+The trained coefficients are loaded once at startup (from the summary cache,
+so usually without touching the data) and served over a small standard
+library HTTP server. Concurrent requests are micro-batched: a single worker
+thread gathers whatever arrives within a short window and scores it with one
+vectorized ScratchLinearRegression.predict call.
+
+Usage:
+    python service.py --port 8000
+
+Endpoints:
+    POST /predict   {"cgpa": 7.5} or {"cgpa": [7.5, 8.1]} -> {"package": ...}
+    GET  /health    readiness and model parameters
+    GET  /stats     request counts, batch sizes and p50/p99 latency
+"""
+
+import argparse
+import json
+import queue
+import threading
+import time
+from collections import deque
+from concurrent.futures import Future
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import numpy as np
+
+from summary import load_summary
+
+
+class LatencyTracker:
+    """
+    Thread-safe record of the most recent request latencies.
+    """
+
+    def __init__(self, window=10000):
+        self._samples = deque(maxlen=window)
+        self._lock = threading.Lock()
+        self.requests = 0
+
+    def record(self, seconds):
+        with self._lock:
+            self._samples.append(seconds)
+            self.requests += 1
+
+    def snapshot(self):
+        """
+        Returns:
+        dict: Request count and p50/p99 latency in milliseconds over the window
+        """
+        with self._lock:
+            samples = np.array(self._samples)
+            requests = self.requests
+
+        if samples.size == 0:
+            return {'requests': requests, 'p50_ms': None, 'p99_ms': None}
+
+        p50, p99 = np.percentile(samples, [50, 99]) * 1e3
+        return {'requests': requests, 'p50_ms': float(p50), 'p99_ms': float(p99)}
+
+
+class MicroBatcher:
+    """
+    Collect concurrent prediction requests into one vectorized predict call.
+
+    The worker blocks until a request arrives, then keeps gathering requests
+    for at most max_wait seconds or until max_batch_size values are queued,
+    scores them all at once and hands every caller its own slice.
+    """
+
+    def __init__(self, model, max_batch_size=4096, max_wait=0.001):
+        self.model = model
+        self.max_batch_size = max_batch_size
+        self.max_wait = max_wait
+        self.batches = 0
+        self.batched_values = 0
+        self._queue = queue.Queue()
+        self._worker = threading.Thread(target=self._run, name='micro-batcher', daemon=True)
+        self._worker.start()
+
+    def submit(self, values):
+        """
+        Queue values for scoring.
+
+        Parameters:
+        values (ndarray): 1-D float array of academic scores
+
+        Returns:
+        Future: Resolves to the array of predictions
+        """
+        future = Future()
+        self._queue.put((values, future))
+        return future
+
+    def _collect(self):
+        pending = [self._queue.get()]
+        size = pending[0][0].size
+        deadline = time.perf_counter() + self.max_wait
+
+        while size < self.max_batch_size:
+            timeout = deadline - time.perf_counter()
+            if timeout <= 0:
+                break
+            try:
+                item = self._queue.get(timeout=timeout)
+            except queue.Empty:
+                break
+            pending.append(item)
+            size += item[0].size
+        return pending
+
+    def _run(self):
+        while True:
+            pending = self._collect()
+            try:
+                values = np.concatenate([item[0] for item in pending])
+                predictions = self.model.predict(values, out=values)
+            except Exception as e:
+                for _, future in pending:
+                    future.set_exception(e)
+                continue
+
+            self.batches += 1
+            self.batched_values += values.size
+
+            offset = 0
+            for item, future in pending:
+                future.set_result(predictions[offset:offset + item.size])
+                offset += item.size
+
+    def stats(self):
+        return {
+            'batches': self.batches,
+            'mean_batch_size': self.batched_values / self.batches if self.batches else None,
+            'queue_depth': self._queue.qsize()
+        }
+
+
+def parse_scores(cgpa):
+    """
+    Validate the cgpa field of a prediction request.
+
+    Parameters:
+    cgpa: Decoded JSON value, a number or a flat list of numbers
+
+    Returns:
+    ndarray: The scores as a 1-D float array
+
+    Raises:
+    ValueError: If cgpa is anything else (booleans, strings, nested lists)
+                or a score is not finite
+    """
+    scores = cgpa if isinstance(cgpa, list) else [cgpa]
+    # bool is a subclass of int, but true is not a score
+    if not all(isinstance(score, (int, float)) and not isinstance(score, bool) for score in scores):
+        raise ValueError("Scores must be a number or a flat list of numbers.")
+
+    values = np.array(scores, dtype=float)
+    if not np.isfinite(values).all():
+        raise ValueError("Scores must be finite numbers.")
+    return values
+
+
+class PredictionHandler(BaseHTTPRequestHandler):
+    """
+    HTTP handler exposing the batcher; server attributes hold shared state.
+    """
+
+    protocol_version = 'HTTP/1.1'
+
+    def log_message(self, format, *args):
+        # Per-request access logging would dominate latency at high rates
+        pass
+
+    def _send_json(self, status, payload):
+        body = json.dumps(payload).encode()
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_GET(self):
+        if self.path == '/health':
+            self._send_json(200, {'status': 'ok', 'parameters': self.server.model.get_parameters()})
+        elif self.path == '/stats':
+            stats = self.server.latency.snapshot()
+            stats.update(self.server.batcher.stats())
+            self._send_json(200, stats)
+        else:
+            self._send_json(404, {'error': 'Not found'})
+
+    def do_POST(self):
+        if self.path != '/predict':
+            self._send_json(404, {'error': 'Not found'})
+            return
+
+        start = time.perf_counter()
+        try:
+            length = int(self.headers.get('Content-Length', 0))
+            payload = json.loads(self.rfile.read(length))
+            cgpa = payload['cgpa']
+            values = parse_scores(cgpa)
+        except (ValueError, TypeError, KeyError):
+            self._send_json(400, {'error': "Expected a JSON body like {\"cgpa\": 7.5} or "
+                                           "{\"cgpa\": [7.5, 8.1]}"})
+            return
+
+        predictions = self.server.batcher.submit(values).result()
+        result = predictions.tolist() if isinstance(cgpa, list) else float(predictions[0])
+
+        self._send_json(200, {'package': result})
+        self.server.latency.record(time.perf_counter() - start)
+
+
+class PredictionServer(ThreadingHTTPServer):
+    """
+    Threaded server with a listen backlog sized for bursts of concurrent clients.
+    """
+
+    daemon_threads = True
+    request_queue_size = 1024
+
+
+def create_server(host, port, model, max_batch_size=4096, max_wait=0.001):
+    """
+    Build the HTTP server around a trained model.
+
+    Parameters:
+    host (str): Interface to bind
+    port (int): Port to bind
+    model (ScratchLinearRegression): Trained model
+    max_batch_size (int): Upper bound on values scored per predict call
+    max_wait (float): Seconds to wait for more requests before scoring a batch
+
+    Returns:
+    PredictionServer: Server ready for serve_forever
+    """
+    server = PredictionServer((host, port), PredictionHandler)
+    server.model = model
+    server.batcher = MicroBatcher(model, max_batch_size, max_wait)
+    server.latency = LatencyTracker()
+    return server
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Serve placement predictions over HTTP/JSON.')
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8000)
+    parser.add_argument('--csv', default='placement_extended.csv',
+                        help='Dataset the model is trained on (cached summary is reused)')
+    parser.add_argument('--max-batch', type=int, default=4096)
+    parser.add_argument('--max-wait-ms', type=float, default=1.0)
+    args = parser.parse_args()
+
+    model, _ = load_summary(args.csv)
+    server = create_server(args.host, args.port, model, args.max_batch, args.max_wait_ms / 1e3)
+
+    print(f"Serving predictions on http://{args.host}:{args.port}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+
+if __name__ == '__main__':
+    main()
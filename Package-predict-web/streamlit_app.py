@@ -1,8 +1,17 @@
+import os
+import tempfile
 import streamlit as st
-import pandas as pd
-import numpy as np
-import matplotlib.pyplot as plt
-from model import ScratchLinearRegression
+from data_cache import data_version, load_frame
+from plotting import DashboardFigure, compute_density, compute_histogram
+from summary import load_summary
+from batch_scoring import score_csv
+
+# Files scored in the app are offered for download, which reads them into memory;
+# larger files go through the batch_scoring command line tool instead
+MAX_DOWNLOAD_BYTES = 50 * 2 ** 20
+LARGE_FILE_HINT = ("Files over {limit} MB are not scored in the browser. Score them with "
+                   "`python batch_scoring.py input.csv predictions.{format}`, which streams "
+                   "the results to disk.")
 
 # Set page configuration
 st.set_page_config(
@@ -47,17 +56,20 @@ correlate with professional opportunities.
 """)
 
 # Load and prepare data
-@st.cache_data
-def load_data():
-    try:
-        df = pd.read_csv('placement_extended.csv')
-        return df
-    except FileNotFoundError:
-        st.error("Required data file not found. Please ensure the dataset is available in the specified location.")
-        return None
+DATA_PATH = 'placement_extended.csv'
+
+@st.cache_resource
+def load_data(path, version):
+    # Memory-mapped columnar cache; the version argument invalidates it when the CSV changes
+    return load_frame(path)
 
 # Load data
-df = load_data()
+try:
+    data_version_key = data_version(DATA_PATH)
+    df = load_data(DATA_PATH, data_version_key)
+except FileNotFoundError:
+    st.error("Required data file not found. Please ensure the dataset is available in the specified location.")
+    df = None
 
 if df is not None:
     # Sidebar for analysis parameters
@@ -79,19 +91,35 @@ if df is not None:
             ["Single Prediction", "Comparative Analysis"],
             help="Choose the type of analysis to perform"
         )
+        
+        plot_mode = st.selectbox(
+            "Plot Rendering",
+            ["Density (fast)", "Scatter (all points)"],
+            help="Density rendering draws pre-binned data and stays fast for large datasets"
+        )
 
-    # Train model
+    # Train model; coefficients and dataset statistics are computed once per data version
     @st.cache_resource
-    def train_model():
-        lr = ScratchLinearRegression()
-        X = df['cgpa'].values
-        y = df['package'].values
-        lr.fit(X, y)
-        return lr
+    def train_model(version):
+        return load_summary(DATA_PATH)
+
+    @st.cache_data
+    def plot_layers(version):
+        return (compute_density(df['cgpa'].values, df['package'].values),
+                compute_histogram(df['package'].values))
+
+    @st.cache_resource
+    def dashboard_figure(version, scatter):
+        # Static layers rendered once per data version and plot mode
+        model, _ = train_model(version)
+        density, histogram = plot_layers(version)
+        if scatter:
+            return DashboardFigure(model, histogram, points=(df['cgpa'].values, df['package'].values))
+        return DashboardFigure(model, histogram, density=density)
 
     # Train the model
     try:
-        model = train_model()
+        model, summary = train_model(data_version_key)
         
         # Key Metrics Section
         st.subheader("Dataset Overview")
@@ -99,22 +127,22 @@ if df is not None:
         
         with col1:
             st.markdown('<div class="metric-card">', unsafe_allow_html=True)
-            st.metric("Total Observations", f"{len(df):,}")
+            st.metric("Total Observations", f"{summary['rows']:,}")
             st.markdown('</div>', unsafe_allow_html=True)
             
         with col2:
             st.markdown('<div class="metric-card">', unsafe_allow_html=True)
-            st.metric("Mean Academic Score", f"{df['cgpa'].mean():.2f}")
+            st.metric("Mean Academic Score", f"{summary['cgpa_mean']:.2f}")
             st.markdown('</div>', unsafe_allow_html=True)
             
         with col3:
             st.markdown('<div class="metric-card">', unsafe_allow_html=True)
-            st.metric("Mean Career Outcome", f"{df['package'].mean():.2f}")
+            st.metric("Mean Career Outcome", f"{summary['package_mean']:.2f}")
             st.markdown('</div>', unsafe_allow_html=True)
             
         with col4:
             st.markdown('<div class="metric-card">', unsafe_allow_html=True)
-            st.metric("Correlation Coefficient", f"{df['cgpa'].corr(df['package']):.3f}")
+            st.metric("Correlation Coefficient", f"{summary['correlation']:.3f}")
             st.markdown('</div>', unsafe_allow_html=True)
 
         # Model Information
@@ -157,54 +185,19 @@ if df is not None:
         # Visualization Section
         st.subheader("Statistical Visualization")
         
-        fig, (ax1, ax2) = plt.subplots(1, 2, figsize=(16, 6))
-
-        # Scatter plot with regression line
-        ax1.scatter(df['cgpa'], df['package'], alpha=0.7, color='#3498db', s=50, label='Observations')
-        
-        x_range = np.linspace(df['cgpa'].min(), df['cgpa'].max(), 100)
-        y_pred_line = model.predict(x_range)
-        ax1.plot(x_range, y_pred_line, color='#e74c3c', linewidth=2.5, label='Regression Line')
-
-        if cgpa_input is not None:
-            pred_value = model.predict(cgpa_input)
-            ax1.scatter([cgpa_input], [pred_value], color='#2ecc71', s=150, 
-                      label=f'Analysis Point (Score={cgpa_input})', zorder=5, edgecolors='black')
-
-        ax1.set_xlabel('Academic Performance Score', fontsize=12)
-        ax1.set_ylabel('Career Outcome Metric', fontsize=12)
-        ax1.set_title('Relationship Analysis: Academic Performance vs Career Outcomes', fontsize=14, pad=20)
-        ax1.legend()
-        ax1.grid(True, alpha=0.2)
-
-        # Distribution analysis
-        ax2.hist(df['package'], bins=25, alpha=0.8, color='#9b59b6', edgecolor='white', linewidth=0.5)
-        ax2.axvline(df['package'].mean(), color='#e74c3c', linestyle='--', linewidth=2, 
-                   label=f'Mean: {df["package"].mean():.2f}')
-        ax2.set_xlabel('Career Outcome Metric', fontsize=12)
-        ax2.set_ylabel('Frequency', fontsize=12)
-        ax2.set_title('Distribution of Career Outcomes', fontsize=14, pad=20)
-        ax2.legend()
-        ax2.grid(True, alpha=0.2)
-
-        plt.tight_layout()
-        st.pyplot(fig)
+        # The rendered layers are cached per data version; only the line and marker are drawn per rerun
+        figure = dashboard_figure(data_version_key, plot_mode == "Scatter (all points)")
+        st.image(figure.render(cgpa_input), width='stretch')
 
         # Model Performance Metrics
         st.subheader("Model Performance Assessment")
         
-        X_all = df['cgpa'].values.astype(float)
-        y_all = df['package'].values.astype(float)
-        y_pred_all = model.predict(X_all)
-
-        # Calculate performance metrics
-        mse = np.mean((y_all - y_pred_all) ** 2)
-        rmse = np.sqrt(mse)
-        mae = np.mean(np.abs(y_all - y_pred_all))
-        
-        ss_res = np.sum((y_all - y_pred_all) ** 2)
-        ss_tot = np.sum((y_all - np.mean(y_all)) ** 2)
-        r_squared = 1 - (ss_res / ss_tot) if ss_tot != 0 else 0
+        # Metrics were computed together with the model, once per data version
+        performance = summary['performance']
+        mse = performance['mse']
+        rmse = performance['rmse']
+        mae = performance['mae']
+        r_squared = performance['r_squared']
 
         perf_col1, perf_col2, perf_col3, perf_col4 = st.columns(4)
         with perf_col1:
@@ -216,6 +209,45 @@ if df is not None:
         with perf_col4:
             st.metric("R-squared", f"{r_squared:.4f}")
 
+        # Batch Scoring Section
+        st.subheader("Batch Scoring")
+        st.markdown("Upload a CSV with a `cgpa` column to project career outcomes for every row.")
+        
+        uploaded = st.file_uploader("Student File", type=["csv"])
+        output_format = st.radio("Output Format", ["csv", "parquet"], horizontal=True)
+        
+        limit_message = LARGE_FILE_HINT.format(limit=MAX_DOWNLOAD_BYTES // 2 ** 20, format=output_format)
+        if uploaded is not None and uploaded.size > MAX_DOWNLOAD_BYTES:
+            st.warning(limit_message)
+        elif uploaded is not None and st.button("Score File"):
+            progress_bar = st.progress(0.0, text="Scoring...")
+            
+            def report_progress(rows, fraction):
+                progress_bar.progress(fraction or 0.0, text=f"Scored {rows:,} rows")
+            
+            # Results are streamed chunk by chunk to a temporary file, not held in memory
+            output_file = tempfile.NamedTemporaryFile(suffix=f".{output_format}", delete=False)
+            output_file.close()
+            try:
+                scored_rows = score_csv(uploaded, output_file.name, model,
+                                        output_format=output_format, progress=report_progress)
+                progress_bar.progress(1.0, text=f"Scored {scored_rows:,} rows")
+                
+                if os.path.getsize(output_file.name) > MAX_DOWNLOAD_BYTES:
+                    st.warning(limit_message)
+                else:
+                    with open(output_file.name, 'rb') as scored:
+                        st.download_button(
+                            "Download Predictions",
+                            data=scored,
+                            file_name=f"predictions.{output_format}",
+                            mime="text/csv" if output_format == "csv" else "application/octet-stream"
+                        )
+            except (ValueError, ImportError) as e:
+                st.error(f"Batch scoring failed: {str(e)}")
+            finally:
+                os.remove(output_file.name)
+
         # Interpretation Guide
         st.subheader("Interpretation Guidelines")
         st.markdown("""
@@ -0,0 +1,93 @@
+"""
+Precomputed dataset and model summary for the placement dashboard.
+
+Everything the overview and performance panels show (row count, means,
+correlation, value range, regression coefficients and error metrics) is
+computed once per data version and stored as summary.json next to the
+columnar cache. Reruns and cold starts read that file instead of touching
+the data, and the model is restored from its stored sufficient statistics
+without refitting.
+"""
+
+import json
+import os
+
+import numpy as np
+
+from data_cache import cache_dir_for, data_version, load_columns
+from model import ScratchLinearRegression
+
+SUMMARY_FILE = 'summary.json'
+
+
+def summarize(x, y, model):
+    """
+    Compute dataset- and model-level statistics of a fitted dataset.
+
+    Means and correlation come from the model's sufficient statistics; only
+    the value range and the error metrics need a pass over the data.
+
+    Parameters:
+    x (array-like): Academic performance scores the model was fitted on
+    y (array-like): Career outcome values the model was fitted on
+    model (ScratchLinearRegression): Model fitted on x and y
+
+    Returns:
+    dict: Summary statistics, coefficients and sufficient statistics
+    """
+    statistics = model.get_statistics()
+    spread = np.sqrt(statistics['sxx'] * statistics['syy'])
+
+    return {
+        'rows': statistics['n'],
+        'cgpa_mean': statistics['x_mean'],
+        'package_mean': statistics['y_mean'],
+        'correlation': statistics['sxy'] / spread if spread else 0.0,
+        'cgpa_min': float(np.min(x)),
+        'cgpa_max': float(np.max(x)),
+        'parameters': model.get_parameters(),
+        'statistics': statistics,
+        'performance': model.evaluate(x, y)
+    }
+
+
+def load_summary(csv_path, cache_dir=None):
+    """
+    Return the trained model and its summary for the current data version,
+    computing and storing them only when the data has changed.
+
+    Parameters:
+    csv_path (str): Path of the source CSV
+    cache_dir (str, optional): Cache directory, defaults to cache_dir_for(csv_path)
+
+    Returns:
+    tuple: (ScratchLinearRegression, summary dict)
+
+    Raises:
+    FileNotFoundError: If the source file does not exist
+    """
+    cache_dir = cache_dir or cache_dir_for(csv_path)
+    path = os.path.join(cache_dir, SUMMARY_FILE)
+    version = data_version(csv_path)
+
+    try:
+        with open(path) as f:
+            summary = json.load(f)
+        if summary.get('version') == version:
+            return ScratchLinearRegression.from_statistics(summary['statistics']), summary
+    except (OSError, ValueError, KeyError):
+        pass
+
+    columns = load_columns(csv_path, cache_dir=cache_dir)
+    model = ScratchLinearRegression()
+    model.fit(columns['cgpa'], columns['package'])
+
+    summary = summarize(columns['cgpa'], columns['package'], model)
+    summary['version'] = version
+
+    temporary = path + '.tmp'
+    with open(temporary, 'w') as f:
+        json.dump(summary, f, indent=2)
+    os.replace(temporary, path)
+
+    return model, summary
@@ -0,0 +1,42 @@
+import pandas as pd
+import pytest
+
+from batch_scoring import PREDICTION_COLUMN, score_csv
+from model import ScratchLinearRegression
+
+
+@pytest.fixture
+def model():
+    model = ScratchLinearRegression()
+    model.fit([5.0, 6.0, 7.0, 8.0], [2.0, 2.5, 3.0, 3.5])
+    return model
+
+
+def test_parquet_columns_widen_across_chunks(tmp_path, model):
+    # 'bonus' is integer in the first chunk and decimal later; 'note' is empty at first
+    source = tmp_path / 'students.csv'
+    source.write_text("cgpa,bonus,note\n7.0,1,\n8.0,2,\n6.0,2.5,late\n")
+    destination = tmp_path / 'scored.parquet'
+
+    rows = score_csv(str(source), str(destination), model, output_format='parquet', chunksize=2)
+
+    scored = pd.read_parquet(destination)
+    assert rows == 3
+    assert scored['bonus'].tolist() == [1.0, 2.0, 2.5]
+    assert scored['note'].tolist()[2] == 'late'
+    assert scored[PREDICTION_COLUMN].tolist() == pytest.approx([3.0, 3.5, 2.5])
+
+
+@pytest.mark.parametrize('output_format', ['csv', 'parquet'])
+@pytest.mark.parametrize('content', ['', 'cgpa,name\n'])
+def test_empty_input_still_writes_output(tmp_path, model, output_format, content):
+    source = tmp_path / 'students.csv'
+    source.write_text(content)
+    destination = tmp_path / f'scored.{output_format}'
+
+    rows = score_csv(str(source), str(destination), model, output_format=output_format)
+
+    scored = pd.read_csv(destination) if output_format == 'csv' else pd.read_parquet(destination)
+    assert rows == 0
+    assert len(scored) == 0
+    assert {'cgpa', PREDICTION_COLUMN} <= set(scored.columns)
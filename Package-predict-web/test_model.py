@@ -0,0 +1,65 @@
+import numpy as np
+import pytest
+
+from model import GroupedLinearRegression, ScratchLinearRegression
+
+
+@pytest.fixture
+def data():
+    rng = np.random.default_rng(0)
+    X = rng.uniform(5, 10, 1000)
+    y = 0.6 * X - 1.2 + rng.normal(0, 0.3, X.size)
+    return X, y
+
+
+def test_evaluate_without_data_after_fit(data):
+    X, y = data
+    model = ScratchLinearRegression()
+    model.fit(X, y)
+
+    results = model.evaluate()
+
+    assert set(results) == {'mse', 'rmse', 'r_squared'}
+    expected = model.evaluate(X, y)
+    for name, value in results.items():
+        assert value == pytest.approx(expected[name])
+
+
+def test_evaluate_without_data_after_partial_fit(data):
+    X, y = data
+    model = ScratchLinearRegression()
+    for start in range(0, X.size, 250):
+        model.partial_fit(X[start:start + 250], y[start:start + 250])
+
+    results = model.evaluate()
+
+    assert results['r_squared'] == pytest.approx(model.calculate_r_squared(X, y))
+
+
+def test_evaluate_without_data_rejects_mae(data):
+    model = ScratchLinearRegression()
+    model.fit(*data)
+
+    with pytest.raises(ValueError, match="raw data"):
+        model.evaluate(metrics=('mae',))
+
+
+def test_grouped_fit_matches_one_fit_per_group(data, monkeypatch):
+    X, y = data
+    groups = np.arange(X.size) % 7
+    X[groups == 3] = 7.3
+    # Small chunks so the moments are accumulated across many of them
+    monkeypatch.setattr(ScratchLinearRegression, 'chunk_size', 64)
+
+    model = GroupedLinearRegression().fit(X, y, groups)
+
+    for code, key in enumerate(model.groups):
+        rows = groups == key
+        assert model.n[code] == rows.sum()
+        if key == 3:
+            assert np.isnan(model.m[code]) and np.isnan(model.b[code])
+            continue
+        single = ScratchLinearRegression()
+        single.fit(X[rows], y[rows])
+        assert model.m[code] == pytest.approx(single.m)
+        assert model.b[code] == pytest.approx(single.b)
@@ -0,0 +1,44 @@
+import json
+import threading
+import urllib.error
+import urllib.request
+
+import pytest
+
+from model import ScratchLinearRegression
+from service import create_server
+
+
+@pytest.fixture
+def url():
+    model = ScratchLinearRegression()
+    model.fit([5.0, 6.0, 7.0, 8.0], [2.0, 2.5, 3.0, 3.5])
+    server = create_server('127.0.0.1', 0, model)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{server.server_address[1]}/predict"
+    server.shutdown()
+    server.server_close()
+
+
+def post(url, payload):
+    request = urllib.request.Request(url, data=json.dumps(payload).encode(),
+                                     headers={'Content-Type': 'application/json'})
+    try:
+        with urllib.request.urlopen(request) as response:
+            return response.status, json.load(response)
+    except urllib.error.HTTPError as error:
+        return error.code, json.load(error)
+
+
+def test_predicts_scalar_and_flat_list(url):
+    assert post(url, {'cgpa': 7}) == (200, {'package': pytest.approx(3.0)})
+    assert post(url, {'cgpa': [6.0, 8.0]}) == (200, {'package': pytest.approx([2.5, 3.5])})
+
+
+@pytest.mark.parametrize('cgpa', [[[1, 2], [3, 4]], True, [7.5, False], '7.5', None, {'value': 7.5}])
+def test_rejects_anything_but_numbers(url, cgpa):
+    status, body = post(url, {'cgpa': cgpa})
+
+    assert status == 400
+    assert 'error' in body
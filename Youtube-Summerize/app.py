@@ -1,49 +1,249 @@
-from flask import Flask, render_template, request, redirect, url_for, flash
-from youtube_transcript_api import YouTubeTranscriptApi, TranscriptsDisabled
-from transformers import pipeline
+from flask import Flask, render_template, request, redirect, url_for, flash, jsonify, g
+from model_loader import BACKEND, GENERATION_KWARGS, MODEL_NAME, NUM_THREADS, ModelLoader
+from map_reduce import CHUNK_TOKENS, OVERLAP_TOKENS, summarize_transcript
+from transcripts import CachedTranscriptFetcher, default_fetcher
+from cache import Cache, cache_key
+from jobs import JobQueue, QueueFull
+from batching import MicroBatcher
+from metrics import ERRORS, HTTP_SECONDS, JOBS_RUNNING, QUEUE_DEPTH, REGISTRY, STAGE_SECONDS
+import cProfile
+import gc
+import hashlib
+import io
+import os
+import pstats
 import re
+import time
 
 
 app = Flask(__name__)
 app.secret_key = 'ytsummarizer'
 
 #Loading models
-print("Now Loading Models...")
-summarizer = pipeline("summarization", model="sshleifer/distilbart-cnn-12-6")
-print("Model Completely Loaded")
+loader = ModelLoader()
+if os.environ.get('SUMMARIZER_PRELOAD') == '1':
+    # gunicorn master (see gunicorn.conf.py): load before forking so workers share the
+    # weights copy-on-write, and freeze them out of the GC so collections don't touch them
+    print("Now Loading Models...")
+    loader.load()
+    gc.freeze()
+    print("Model Completely Loaded")
+else:
+    loader.start()
+
+# Transcripts by video and language, summaries by transcript and everything that shapes them
+cache = Cache()
+fetcher = CachedTranscriptFetcher(default_fetcher(), cache)
+
+
+def summary_key(text):
+    return cache_key(transcript=hashlib.sha256(text.encode('utf-8')).hexdigest(),
+                     model=MODEL_NAME,
+                     backend=BACKEND,
+                     generation=GENERATION_KWARGS,
+                     chunk_tokens=CHUNK_TOKENS,
+                     overlap_tokens=OVERLAP_TOKENS)
+
+
+# With SUMMARIZER_PROFILING=1, ?profile=1 runs a request (and the job it submits) under
+# cProfile and writes the report to PROFILE_DIR
+PROFILING = os.environ.get('SUMMARIZER_PROFILING') == '1'
+PROFILE_DIR = os.environ.get('SUMMARIZER_PROFILE_DIR',
+                             os.path.join(os.path.dirname(os.path.abspath(__file__)), '.cache', 'profiles'))
+
+
+def profile_report(profiler, name):
+    # Dump the raw stats for snakeviz/pstats and return the top functions by cumulative time
+    os.makedirs(PROFILE_DIR, exist_ok=True)
+    path = os.path.join(PROFILE_DIR, f"{time.strftime('%Y%m%d-%H%M%S')}-{name}.prof")
+    profiler.dump_stats(path)
+    report = io.StringIO()
+    pstats.Stats(profiler, stream=report).sort_stats('cumulative').print_stats(40)
+    return path, report.getvalue()
+
+
+# Seconds a job waits for the model to finish loading before failing
+MODEL_WAIT = float(os.environ.get('SUMMARIZER_MODEL_WAIT', 300))
+
+
+# Chunks of concurrent jobs share batched forward passes
+batcher = MicroBatcher(lambda: loader.get(timeout=MODEL_WAIT))
+
+
+def run_summary_job(video_id, language, profile=False):
+    if profile:
+        # Profiled jobs run in this thread instead of the micro-batcher's, so the report
+        # covers fetching, tokenization and generation
+        profiler = cProfile.Profile()
+        profiler.enable()
+        try:
+            result = summarize_video(video_id, language, loader.get(timeout=MODEL_WAIT))
+        finally:
+            profiler.disable()
+        result['profile_path'], result['profile'] = profile_report(profiler, f"job-{video_id}")
+        return result
+    return summarize_video(video_id, language, batcher)
+
+
+def summarize_video(video_id, language, summarizer):
+    with STAGE_SECONDS.time(stage='fetch'):
+        full_text = fetcher.fetch(video_id, language)
+
+    # The whole transcript is summarized in chunks, then the chunk summaries
+    def compute_summary():
+        summary, _ = summarize_transcript(summarizer, full_text)
+        return summary
+
+    summary = cache.get_or_compute('summary', summary_key(full_text), compute_summary)
+    return {'video_id': video_id, 'summary': summary, 'full': full_text}
+
+
+# Fetching and inference run in the background; requests for a video that is already
+# being summarized join that job
+jobs = JobQueue(run_summary_job)
+
+
+def collect_job_metrics():
+    stats = jobs.stats()
+    QUEUE_DEPTH.set(stats['queue_depth'])
+    JOBS_RUNNING.set(stats['running'])
+
+
+REGISTRY.add_collector(collect_job_metrics)
+
+
+# ISO 639 language, optionally with a region or script, e.g. "en", "pt-BR", "zh-Hans"
+LANGUAGE_PATTERN = re.compile(r"[a-z]{2,3}(-[A-Za-z]{2,4})?")
+
 
 def get_video_id(url):
     pattern = r"(?:v=|youtu\.be/)([a-zA-z)-9_-]{11})"
-    match = re.search(pattern, url)
+    match = re.search(pattern, url or '')
     return match.group(1) if match else None
 
 
+def submit_job(url, language='en', profile=False):
+    video_id = get_video_id(url)
+    if not video_id:
+        raise ValueError("Invalid YouTube URL")
+    if not isinstance(language, str) or not LANGUAGE_PATTERN.fullmatch(language):
+        raise ValueError("Invalid language code")
+    if profile:
+        # Never coalesced with an unprofiled job, whose result would have no report
+        job, _ = jobs.submit(f"{video_id}:{language}:profile:{time.time()}", video_id=video_id,
+                             language=language, profile=True)
+        return job
+    job, _ = jobs.submit(f"{video_id}:{language}", video_id=video_id, language=language)
+    return job
+
+
+def job_status(job):
+    end = job['finished'] or time.time()
+    status = {
+        'id': job['id'],
+        'status': job['status'],
+        'wait_seconds': (job['started'] or end) - job['submitted'],
+        'elapsed_seconds': end - job['submitted'],
+        'error': job['error'],
+    }
+    if job['status'] == 'done':
+        status.update(job['result'])
+    return status
+
+
+def render(template, **context):
+    with STAGE_SECONDS.time(stage='render'):
+        return render_template(template, **context)
+
+
+def profiling_requested():
+    return PROFILING and request.args.get('profile') == '1'
+
+
+@app.before_request
+def start_timer():
+    g.start = time.perf_counter()
+    if profiling_requested():
+        g.profiler = cProfile.Profile()
+        g.profiler.enable()
+
+
+@app.after_request
+def record_request(response):
+    profiler = g.pop('profiler', None)
+    if profiler is not None:
+        profiler.disable()
+        path, _ = profile_report(profiler, request.endpoint or 'request')
+        response.headers['X-Profile'] = path
+    HTTP_SECONDS.observe(time.perf_counter() - g.start, endpoint=request.endpoint or 'unknown',
+                         status=response.status_code)
+    return response
+
+
+@app.teardown_request
+def record_error(error):
+    if error is not None:
+        ERRORS.inc(type=type(error).__name__)
+
+
 @app.route('/', methods=['POST', 'GET'])
 def index():
     if request.method == 'POST':
-        url = request.form.get('yt_url')
-        video_id = get_video_id(url)
-
-        if not video_id:
-            flash("Invalid YouTube URL")
-            return redirect(url_for('index'))
-        
         try:
-            transcript = YouTubeTranscriptApi().fetch(video_id, languages=['en']).to_raw_data()
-            full_text = " ".join([entry['text'] for entry in transcript])
+            job = submit_job(request.form.get('yt_url'), profile=profiling_requested())
+        except ValueError as e:
+            flash(str(e))
+            return redirect(url_for('index'))
+        except QueueFull:
+            flash("The summarizer is busy, please try again in a moment")
+            return redirect(url_for('index'))
+        return redirect(url_for('result', job_id=job['id']))
+    
+    return render('index.html')
 
-            # Check if too long
-            if len(full_text) > 1000:
-                full_text = full_text[:1000]
 
-            summary = summarizer(full_text, max_length=150, min_length=30, do_sample=False)[0]['summary_text']
+@app.route('/result/<job_id>')
+def result(job_id):
+    if jobs.get(job_id) is None:
+        flash("This summary has expired, please submit the video again")
+        return redirect(url_for('index'))
+    return render('result.html', job_id=job_id)
 
-            return render_template('result.html', summary=summary, full=full_text)
-        except TranscriptsDisabled:
-            flash("transcript disabled for this video")
-            return redirect(url_for('index.html'))
-    
-    return render_template('index.html')
+
+@app.route('/jobs', methods=['POST'])
+def create_job():
+    # JSON API: {"yt_url": ...} -> 202 with the job, poll GET /jobs/<id>
+    payload = request.get_json(silent=True) or request.form
+    try:
+        job = submit_job(payload.get('yt_url'), payload.get('language', 'en'), profiling_requested())
+    except ValueError as e:
+        return jsonify(error=str(e)), 400
+    except QueueFull as e:
+        return jsonify(error=str(e)), 503
+    return jsonify(job_status(job)), 202, {'Location': url_for('get_job', job_id=job['id'])}
+
+
+@app.route('/jobs/<job_id>')
+def get_job(job_id):
+    job = jobs.get(job_id)
+    if job is None:
+        return jsonify(error="Unknown or expired job"), 404
+    return jsonify(job_status(job))
+
+
+@app.route('/health')
+def health():
+    # 200 once the model is loaded and warmed up, 503 while loading or after a failure
+    status = loader.status()
+    status.update(backend=BACKEND, threads=NUM_THREADS, cache=cache.stats(), jobs=jobs.stats(),
+                  batching=batcher.stats())
+    return jsonify(status), 200 if loader.ready else 503
+
+
+@app.route('/metrics')
+def metrics():
+    # Prometheus text format, summed over all gunicorn workers when METRICS_DIR is set
+    return REGISTRY.render(), 200, {'Content-Type': 'text/plain; version=0.0.4; charset=utf-8'}
 
 
 
@@ -0,0 +1,162 @@
+"""
+Dynamic micro-batching in front of the summarization pipeline.
+
+Concurrent jobs each hand their texts to one MicroBatcher. A single worker
+thread waits for the first text, keeps collecting for a short window or
+until the batch is full, groups what it has by generation settings and
+similar input length (so little of each batch is padding), and runs every
+group as one batched generate call. Under load the batches grow, so
+summaries per second rise with the number of concurrent requests instead of
+staying at one forward pass per request.
+
+The batcher is called like the pipeline itself (texts in, list of
+{"summary_text": ...} out) and exposes its tokenizer, so map_reduce works
+with either.
+"""
+
+import json
+import os
+import queue
+import threading
+import time
+from concurrent.futures import Future
+
+from metrics import BATCH_SIZE, INPUT_TOKENS, OUTPUT_TOKENS, STAGE_SECONDS, TOKENS_PER_SECOND
+
+BATCH_MAX_SIZE = int(os.environ.get("SUMMARIZER_BATCH_MAX_SIZE", 16))
+BATCH_WAIT = float(os.environ.get("SUMMARIZER_BATCH_WAIT_MS", 10)) / 1e3
+# A text joins a batch only while it is at most this many times longer than the batch's shortest
+BATCH_LENGTH_RATIO = float(os.environ.get("SUMMARIZER_BATCH_LENGTH_RATIO", 1.5))
+
+
+class MicroBatcher:
+    """
+    Collect concurrent summarization requests into batched pipeline calls.
+
+    get_pipeline() returns the loaded pipeline (e.g. ModelLoader.get); it is
+    called in the caller's thread, so loading errors reach the caller.
+    """
+
+    def __init__(self, get_pipeline, max_batch_size=BATCH_MAX_SIZE, max_wait=BATCH_WAIT,
+                 max_length_ratio=BATCH_LENGTH_RATIO):
+        self.get_pipeline = get_pipeline
+        self.max_batch_size = max_batch_size
+        self.max_wait = max_wait
+        self.max_length_ratio = max_length_ratio
+        self.batches = 0
+        self.batched_texts = 0
+        self.real_tokens = 0
+        self.padded_tokens = 0
+        self._queue = queue.Queue()
+        self._lock = threading.Lock()
+        self._pid = None
+
+    @property
+    def tokenizer(self):
+        return self.get_pipeline().tokenizer
+
+    def _ensure_worker(self):
+        # Threads do not survive a fork, so start the worker in the process that uses it
+        with self._lock:
+            if self._pid == os.getpid():
+                return
+            self._pid = os.getpid()
+        threading.Thread(target=self._run, name="micro-batcher", daemon=True).start()
+
+    def submit(self, text, **generation_kwargs):
+        """Queue one text; returns a Future resolving to its summary."""
+        pipeline = self.get_pipeline()
+        self._ensure_worker()
+        with STAGE_SECONDS.time(stage="tokenize"):
+            length = len(pipeline.tokenizer(text, add_special_tokens=False, verbose=False)["input_ids"])
+        future = Future()
+        self._queue.put((text, length, json.dumps(generation_kwargs, sort_keys=True), future))
+        return future
+
+    def __call__(self, inputs, batch_size=None, truncation=True, **generation_kwargs):
+        # batch_size is accepted for pipeline compatibility; batches are formed here
+        texts = [inputs] if isinstance(inputs, str) else list(inputs)
+        futures = [self.submit(text, **generation_kwargs) for text in texts]
+        return [{"summary_text": future.result()} for future in futures]
+
+    def _collect(self):
+        pending = [self._queue.get()]
+        deadline = time.perf_counter() + self.max_wait
+
+        while len(pending) < self.max_batch_size:
+            timeout = deadline - time.perf_counter()
+            if timeout <= 0:
+                break
+            try:
+                pending.append(self._queue.get(timeout=timeout))
+            except queue.Empty:
+                break
+        return pending
+
+    def _group(self, pending):
+        """Split requests into batches of equal generation settings and similar length."""
+        groups = []
+        for item in sorted(pending, key=lambda item: (item[2], item[1])):
+            group = groups[-1] if groups else None
+            if (group is None or group[0][2] != item[2] or len(group) >= self.max_batch_size
+                    or item[1] > max(group[0][1], 1) * self.max_length_ratio):
+                groups.append([item])
+            else:
+                group.append(item)
+        return groups
+
+    def _run(self):
+        while True:
+            pending = self._collect()
+            try:
+                groups = self._group(pending)
+                for group in groups:
+                    self._run_group(group)
+            except Exception as e:
+                # Keep the worker alive: its _pid means it is never restarted in this process
+                for item in pending:
+                    if not item[3].done():
+                        item[3].set_exception(e)
+
+    def _run_group(self, group):
+        texts = [item[0] for item in group]
+        try:
+            pipeline = self.get_pipeline()
+            start = time.perf_counter()
+            outputs = pipeline(texts, batch_size=len(texts), truncation=True,
+                               **json.loads(group[0][2]))
+            seconds = time.perf_counter() - start
+        except Exception as e:
+            for item in group:
+                item[3].set_exception(e)
+            return
+
+        for item, output in zip(group, outputs):
+            item[3].set_result(output["summary_text"])
+        if len(outputs) != len(group):
+            raise RuntimeError(f"pipeline returned {len(outputs)} summaries for {len(group)} texts")
+
+        lengths = [item[1] for item in group]
+        generated = sum(len(pipeline.tokenizer(output["summary_text"], add_special_tokens=False,
+                                               verbose=False)["input_ids"])
+                        for output in outputs)
+        STAGE_SECONDS.observe(seconds, stage="generate")
+        BATCH_SIZE.observe(len(group))
+        INPUT_TOKENS.inc(sum(lengths))
+        OUTPUT_TOKENS.inc(generated)
+        TOKENS_PER_SECOND.observe(generated / seconds if seconds else 0.0)
+        with self._lock:
+            self.batches += 1
+            self.batched_texts += len(group)
+            self.real_tokens += sum(lengths)
+            self.padded_tokens += max(lengths) * len(group)
+
+    def stats(self):
+        with self._lock:
+            return {
+                "batches": self.batches,
+                "mean_batch_size": self.batched_texts / self.batches if self.batches else None,
+                # Share of the batched input tokens that were not padding
+                "padding_efficiency": self.real_tokens / self.padded_tokens if self.padded_tokens else None,
+                "queue_depth": self._queue.qsize(),
+            }
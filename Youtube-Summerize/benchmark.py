@@ -0,0 +1,208 @@
+"""
+Benchmark of the summarizer inference backends on a fixed local corpus.
+
+Every backend in model_loader.BACKENDS is loaded and run over the
+transcripts in benchmark_corpus.json with the app's generation settings,
+measuring load time, per-document latency (one request at a time) and
+batched throughput. The summaries of each backend are compared with those
+of the reference backend (the first one given) by ROUGE-L F1 and exact
+match, so a faster backend can be checked for drift. With --loads, the
+reference backend is also driven by that many concurrent clients, once
+calling the pipeline directly and once through the app's MicroBatcher, to
+show how throughput scales with load. No network access is needed once the
+model is in the local Hugging Face cache.
+
+Usage:
+    python benchmark.py --backends torch quantized onnx --threads 4
+    python benchmark.py --backends torch onnx --batch-size 8 --output results.json
+    python benchmark.py --backends torch --loads 1 4 16
+"""
+
+import argparse
+import json
+import os
+import platform
+import statistics
+import subprocess
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
+
+from batching import MicroBatcher
+from model_loader import BACKENDS, GENERATION_KWARGS, MODEL_NAME, load_summarizer
+
+DEFAULT_CORPUS = os.path.join(os.path.dirname(os.path.abspath(__file__)), "benchmark_corpus.json")
+
+
+def rouge_l(reference, candidate):
+    """ROUGE-L F1 between two texts over lowercase word tokens."""
+    a, b = reference.lower().split(), candidate.lower().split()
+    if not a or not b:
+        return float(a == b)
+
+    # Longest common subsequence, one row of the DP table at a time
+    previous = [0] * (len(b) + 1)
+    for token in a:
+        current = [0]
+        for j, other in enumerate(b):
+            current.append(previous[j] + 1 if token == other else max(previous[j + 1], current[j]))
+        previous = current
+    lcs = previous[-1]
+    if lcs == 0:
+        return 0.0
+    precision, recall = lcs / len(b), lcs / len(a)
+    return 2 * precision * recall / (precision + recall)
+
+
+def percentile(values, q):
+    ordered = sorted(values)
+    return ordered[min(int(round(q / 100 * (len(ordered) - 1))), len(ordered) - 1)]
+
+
+def bench_backend(backend, texts, model_name, threads, batch_size, repeat):
+    """Load one backend and time it over the corpus; returns (record, summaries)."""
+    start = time.perf_counter()
+    summarizer = load_summarizer(model_name, backend, threads)
+    load_s = time.perf_counter() - start
+
+    # The first call pays for lazy initialization, as the app's warm-up does
+    start = time.perf_counter()
+    summarizer(texts[0], truncation=True, **GENERATION_KWARGS)
+    warmup_s = time.perf_counter() - start
+
+    latencies = []
+    summaries = None
+    for _ in range(repeat):
+        outputs = []
+        for text in texts:
+            start = time.perf_counter()
+            outputs.append(summarizer(text, truncation=True, **GENERATION_KWARGS)[0]["summary_text"])
+            latencies.append(time.perf_counter() - start)
+        summaries = summaries or outputs
+
+    batch_times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        summarizer(texts, batch_size=batch_size, truncation=True, **GENERATION_KWARGS)
+        batch_times.append(time.perf_counter() - start)
+
+    output_tokens = sum(len(summarizer.tokenizer(summary)["input_ids"]) for summary in summaries)
+    sequential_s = sum(latencies) / repeat
+    record = {
+        "backend": backend,
+        "load_s": load_s,
+        "warmup_s": warmup_s,
+        "latency_p50_s": statistics.median(latencies),
+        "latency_p95_s": percentile(latencies, 95),
+        "latency_mean_s": statistics.mean(latencies),
+        "sequential_docs_per_s": len(texts) / sequential_s,
+        "sequential_tokens_per_s": output_tokens / sequential_s,
+        "batched_docs_per_s": len(texts) / min(batch_times),
+        "batched_tokens_per_s": output_tokens / min(batch_times),
+    }
+    return record, summaries
+
+
+def bench_load(summarizer, texts, loads, requests_per_client):
+    """Summaries per second with concurrent clients, calling the pipeline directly or batched."""
+    batcher = MicroBatcher(lambda: summarizer)
+    results = []
+    for mode, target in (("direct", summarizer), ("micro_batched", batcher)):
+        for load in loads:
+            def client(number):
+                for i in range(requests_per_client):
+                    target(texts[(number + i) % len(texts)], truncation=True, **GENERATION_KWARGS)
+
+            start = time.perf_counter()
+            with ThreadPoolExecutor(max_workers=load) as pool:
+                list(pool.map(client, range(load)))
+            elapsed = time.perf_counter() - start
+            record = {"mode": mode, "load": load, "summaries_per_s": load * requests_per_client / elapsed}
+            print(f"  {mode:<14} load={load:<4} {record['summaries_per_s']:8.2f} summaries/s")
+            results.append(record)
+    results.append({"mode": "micro_batched", "batcher": batcher.stats()})
+    return results
+
+
+def environment(threads):
+    try:
+        commit = subprocess.run(["git", "rev-parse", "HEAD"], capture_output=True,
+                                text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        commit = None
+
+    versions = {}
+    for package in ("torch", "transformers", "onnxruntime", "optimum"):
+        try:
+            versions[package] = __import__(package).__version__
+        except (ImportError, AttributeError):
+            versions[package] = None
+
+    return {
+        "timestamp": datetime.now(timezone.utc).isoformat(),
+        "commit": commit,
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "cpu_count": os.cpu_count(),
+        "threads": threads,
+        **versions,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--backends", nargs="+", default=["torch", "quantized"], choices=list(BACKENDS),
+                        help="Backends to compare; the first is the reference for agreement")
+    parser.add_argument("--model", default=MODEL_NAME)
+    parser.add_argument("--corpus", default=DEFAULT_CORPUS, help="JSON list of {id, text} documents")
+    parser.add_argument("--threads", type=int, help="Intra-op threads (default: library default)")
+    parser.add_argument("--batch-size", type=int, default=8)
+    parser.add_argument("--repeat", type=int, default=2)
+    parser.add_argument("--loads", type=int, nargs="+", default=[],
+                        help="Concurrent client counts for the load test (default: skip it)")
+    parser.add_argument("--requests-per-client", type=int, default=4)
+    parser.add_argument("--output", default="benchmark_results.json")
+    args = parser.parse_args()
+
+    with open(args.corpus) as f:
+        corpus = json.load(f)
+    texts = [document["text"] for document in corpus]
+
+    results = []
+    reference = None
+    for backend in args.backends:
+        print(f"Benchmarking {backend}...")
+        record, summaries = bench_backend(backend, texts, args.model, args.threads,
+                                          args.batch_size, args.repeat)
+        if reference is None:
+            reference = summaries
+        scores = [rouge_l(ref, summary) for ref, summary in zip(reference, summaries)]
+        record["rouge_l_vs_reference"] = statistics.mean(scores)
+        record["exact_match_vs_reference"] = sum(
+            ref == summary for ref, summary in zip(reference, summaries)) / len(summaries)
+        record["summaries"] = dict(zip((document["id"] for document in corpus), summaries))
+        results.append(record)
+
+    print(f"\n{'backend':<10}{'load s':>8}{'p50 s':>8}{'p95 s':>8}{'docs/s':>8}"
+          f"{'batch docs/s':>14}{'ROUGE-L':>9}{'exact':>7}")
+    for record in results:
+        print(f"{record['backend']:<10}{record['load_s']:8.1f}{record['latency_p50_s']:8.2f}"
+              f"{record['latency_p95_s']:8.2f}{record['sequential_docs_per_s']:8.2f}"
+              f"{record['batched_docs_per_s']:14.2f}{record['rouge_l_vs_reference']:9.3f}"
+              f"{record['exact_match_vs_reference']:7.0%}")
+
+    load_results = []
+    if args.loads:
+        print(f"\nLoad test on {args.backends[0]}:")
+        summarizer = load_summarizer(args.model, args.backends[0], args.threads)
+        load_results = bench_load(summarizer, texts, args.loads, args.requests_per_client)
+
+    with open(args.output, "w") as f:
+        json.dump({"environment": environment(args.threads), "model": args.model,
+                   "generation": GENERATION_KWARGS, "batch_size": args.batch_size,
+                   "results": results, "load": load_results}, f, indent=2)
+    print(f"\nWrote {len(results)} results to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,180 @@
+"""
+Two-level cache of transcripts and summaries.
+
+A byte-bounded in-process LRU sits in front of a SQLite file shared by all
+workers. Entries live in namespaces ("transcript", "summary"), expire after
+a TTL, and the on-disk store drops its least recently used entries once it
+grows past its size limit. Values are anything JSON-serializable.
+"""
+
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+
+from metrics import CACHE_REQUESTS
+
+CACHE_PATH = os.environ.get("SUMMARIZER_CACHE_PATH",
+                            os.path.join(os.path.dirname(os.path.abspath(__file__)), ".cache", "cache.sqlite3"))
+CACHE_TTL = float(os.environ.get("SUMMARIZER_CACHE_TTL", 7 * 24 * 3600))
+CACHE_MEMORY_BYTES = int(os.environ.get("SUMMARIZER_CACHE_MEMORY_BYTES", 32 * 2 ** 20))
+CACHE_DISK_BYTES = int(os.environ.get("SUMMARIZER_CACHE_DISK_BYTES", 512 * 2 ** 20))
+
+
+def cache_key(**params):
+    """Hash parameters into a stable hex key."""
+    encoded = json.dumps(params, sort_keys=True, default=str).encode("utf-8")
+    return hashlib.sha256(encoded).hexdigest()
+
+
+class Cache:
+    """
+    In-process LRU in front of a SQLite store, with TTL and size-based eviction.
+
+    path=None keeps the cache in memory only. Safe to share between threads;
+    every process (e.g. each forked worker) opens its own SQLite connections.
+    """
+
+    def __init__(self, path=CACHE_PATH, ttl=CACHE_TTL, max_memory_bytes=CACHE_MEMORY_BYTES,
+                 max_disk_bytes=CACHE_DISK_BYTES):
+        self.path = path
+        self.ttl = ttl
+        self.max_memory_bytes = max_memory_bytes
+        self.max_disk_bytes = max_disk_bytes
+        self._memory = OrderedDict()
+        self._memory_bytes = 0
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        self.hits_memory = {}
+        self.hits_disk = {}
+        self.misses = {}
+
+    def _connection(self):
+        # One connection per thread and process: sqlite3 connections must not cross either.
+        # Opened on first use, so a cache created before gunicorn forks (preload_app)
+        # leaves no connection in the master for the workers to inherit
+        connection = getattr(self._local, "connection", None)
+        if connection is None or self._local.pid != os.getpid():
+            os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+            connection = sqlite3.connect(self.path, timeout=30)
+            # WAL lets worker processes read while another one writes
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.execute("PRAGMA synchronous=NORMAL")
+            with connection:
+                connection.execute("CREATE TABLE IF NOT EXISTS entries ("
+                                   "namespace TEXT, key TEXT, value TEXT, size INTEGER, "
+                                   "expires REAL, accessed REAL, PRIMARY KEY (namespace, key))")
+                connection.execute("CREATE INDEX IF NOT EXISTS entries_accessed ON entries (accessed)")
+            self._local.connection = connection
+            self._local.pid = os.getpid()
+        return connection
+
+    def _count(self, result, namespace):
+        counter = {"hit_memory": self.hits_memory, "hit_disk": self.hits_disk, "miss": self.misses}[result]
+        with self._lock:
+            counter[namespace] = counter.get(namespace, 0) + 1
+        CACHE_REQUESTS.inc(namespace=namespace, result=result)
+
+    def _remember(self, item, value, size, expires):
+        # Caller holds the lock
+        if item in self._memory:
+            self._memory_bytes -= self._memory.pop(item)[1]
+        if size > self.max_memory_bytes:
+            return
+        self._memory[item] = (value, size, expires)
+        self._memory_bytes += size
+        while self._memory_bytes > self.max_memory_bytes:
+            _, (_, evicted, _) = self._memory.popitem(last=False)
+            self._memory_bytes -= evicted
+
+    def get(self, namespace, key):
+        """Return the cached value, or None on a miss or after expiry."""
+        item = (namespace, key)
+        now = time.time()
+        with self._lock:
+            entry = self._memory.get(item)
+            if entry is not None and entry[2] <= now:
+                self._memory_bytes -= self._memory.pop(item)[1]
+                entry = None
+            if entry is not None:
+                self._memory.move_to_end(item)
+        if entry is not None:
+            self._count("hit_memory", namespace)
+            return entry[0]
+
+        if self.path:
+            with self._connection() as db:
+                row = db.execute("SELECT value, size, expires FROM entries "
+                                 "WHERE namespace = ? AND key = ? AND expires > ?",
+                                 (namespace, key, now)).fetchone()
+                if row is not None:
+                    # The access time orders size-based eviction
+                    db.execute("UPDATE entries SET accessed = ? WHERE namespace = ? AND key = ?",
+                               (now, namespace, key))
+            if row is not None:
+                value = json.loads(row[0])
+                with self._lock:
+                    self._remember(item, value, row[1], row[2])
+                self._count("hit_disk", namespace)
+                return value
+
+        self._count("miss", namespace)
+        return None
+
+    def put(self, namespace, key, value):
+        """Store a JSON-serializable value in both levels."""
+        encoded = json.dumps(value)
+        size = len(encoded)
+        now = time.time()
+        expires = now + self.ttl
+        with self._lock:
+            self._remember((namespace, key), value, size, expires)
+
+        if not self.path:
+            return
+        with self._connection() as db:
+            db.execute("INSERT OR REPLACE INTO entries VALUES (?, ?, ?, ?, ?, ?)",
+                       (namespace, key, encoded, size, expires, now))
+            db.execute("DELETE FROM entries WHERE expires <= ?", (now,))
+            total = db.execute("SELECT COALESCE(SUM(size), 0) FROM entries").fetchone()[0]
+            if total > self.max_disk_bytes:
+                self._evict(db, total)
+
+    def _evict(self, db, total):
+        # Drop least recently used entries until the store is back under 90% of its limit
+        target = self.max_disk_bytes * 0.9
+        doomed = []
+        for namespace, key, size in db.execute(
+                "SELECT namespace, key, size FROM entries ORDER BY accessed"):
+            if total <= target:
+                break
+            doomed.append((namespace, key))
+            total -= size
+        db.executemany("DELETE FROM entries WHERE namespace = ? AND key = ?", doomed)
+
+    def get_or_compute(self, namespace, key, compute):
+        """Return the cached value, or call compute() and cache its result."""
+        value = self.get(namespace, key)
+        if value is None:
+            value = compute()
+            self.put(namespace, key, value)
+        return value
+
+    def stats(self):
+        """Hit/miss counters and hit rate per namespace, plus the memory level size."""
+        with self._lock:
+            namespaces = set(self.hits_memory) | set(self.hits_disk) | set(self.misses)
+            stats = {"memory_entries": len(self._memory), "memory_bytes": self._memory_bytes}
+            for namespace in sorted(namespaces):
+                hits = self.hits_memory.get(namespace, 0) + self.hits_disk.get(namespace, 0)
+                requests = hits + self.misses.get(namespace, 0)
+                stats[namespace] = {
+                    "hits_memory": self.hits_memory.get(namespace, 0),
+                    "hits_disk": self.hits_disk.get(namespace, 0),
+                    "misses": self.misses.get(namespace, 0),
+                    "hit_rate": hits / requests if requests else 0.0,
+                }
+            return stats
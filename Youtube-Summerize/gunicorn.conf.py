@@ -0,0 +1,42 @@
+"""
+gunicorn settings for the summarizer: gunicorn -c gunicorn.conf.py app:app
+
+The app is imported once in the master, which loads the model before any
+worker is forked (see SUMMARIZER_PRELOAD in app.py). Workers inherit the
+weights copy-on-write instead of each loading their own copy, so starting
+or replacing a worker costs a fork and a warm-up, not a model load.
+
+The ONNX backend is the exception: an ONNX Runtime session and its thread
+pools created in the master can deadlock in forked workers, so with
+SUMMARIZER_BACKEND=onnx every worker loads its own model after the fork.
+"""
+
+import glob
+import os
+
+if os.environ.get("SUMMARIZER_BACKEND") == "onnx":
+    os.environ["SUMMARIZER_PRELOAD"] = "0"
+os.environ.setdefault("SUMMARIZER_PRELOAD", "1")
+# Workers share their metrics through snapshot files, so /metrics covers all of them
+os.environ.setdefault("METRICS_DIR", os.path.join(os.path.dirname(os.path.abspath(__file__)),
+                                                  ".cache", "metrics"))
+
+bind = os.environ.get("BIND", "127.0.0.1:8000")
+workers = int(os.environ.get("WEB_CONCURRENCY", 2))
+preload_app = os.environ["SUMMARIZER_PRELOAD"] == "1"
+timeout = 120
+
+
+def on_starting(server):
+    # Snapshots of a previous run's workers would otherwise be added to this run's totals
+    for path in glob.glob(os.path.join(os.environ["METRICS_DIR"], "*.json")):
+        os.remove(path)
+
+
+def post_fork(server, worker):
+    # With preloading the weights came from the master; warm up in the worker (inference
+    # is not run before forking, as torch's thread pools do not survive a fork) and mark
+    # it ready. Without it, importing the app here starts loading in this worker
+    import app
+
+    app.loader.start()
@@ -0,0 +1,248 @@
+"""
+Background summarization jobs.
+
+Requests only enqueue a job and return its ID; a bounded pool of worker
+threads runs the transcript fetch and inference, and the result page polls
+the job's status. Submissions with the same key (video and language) while
+a job for it is still queued or running join that job instead of starting
+another one.
+
+Job records are mirrored into a SQLite table so that any worker process
+can answer a status poll, and in-flight jobs of other processes are joined
+too. Each process runs its own workers, started on first use so that they
+are created after gunicorn forks.
+"""
+
+import json
+import math
+import os
+import queue
+import sqlite3
+import statistics
+import threading
+import time
+import uuid
+from collections import deque
+
+from metrics import ERRORS, STAGE_SECONDS
+
+# Workers mostly wait on the micro-batcher, so several of them keep its batches full
+JOB_WORKERS = int(os.environ.get("SUMMARIZER_JOB_WORKERS", 8))
+JOB_QUEUE_SIZE = int(os.environ.get("SUMMARIZER_JOB_QUEUE_SIZE", 64))
+# Finished jobs are kept this many seconds for polling
+JOB_RETENTION = float(os.environ.get("SUMMARIZER_JOB_RETENTION", 3600))
+JOBS_PATH = os.environ.get("SUMMARIZER_JOBS_PATH",
+                           os.path.join(os.path.dirname(os.path.abspath(__file__)), ".cache", "jobs.sqlite3"))
+
+
+class QueueFull(Exception):
+    """Raised when a job is submitted while the queue is at capacity."""
+
+
+def _alive(pid):
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        pass
+    return True
+
+
+def _milliseconds(samples):
+    if not samples:
+        return {"p50_ms": None, "p95_ms": None}
+    ordered = sorted(samples)
+    return {"p50_ms": statistics.median(ordered) * 1e3,
+            "p95_ms": ordered[math.ceil(0.95 * len(ordered)) - 1] * 1e3}
+
+
+class JobQueue:
+    """
+    Bounded queue of jobs run by a pool of worker threads.
+
+    run(**payload) does the work and returns a JSON-serializable result;
+    an exception fails the job with its message. Job records are dicts with
+    id, key, status ("queued", "running", "done" or "failed"), timestamps,
+    result and error. path=None keeps the records in this process only.
+    """
+
+    FIELDS = ("id", "key", "status", "submitted", "started", "finished", "result", "error", "pid")
+
+    def __init__(self, run, workers=JOB_WORKERS, max_queued=JOB_QUEUE_SIZE, path=JOBS_PATH,
+                 retention=JOB_RETENTION):
+        self.run = run
+        self.workers = workers
+        self.max_queued = max_queued
+        self.path = path
+        self.retention = retention
+        self._queue = queue.Queue()
+        self._jobs = {}
+        self._inflight = {}
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        self._pid = None
+        self._running = 0
+        self._waits = deque(maxlen=1000)
+        self._runtimes = deque(maxlen=1000)
+        self.counts = {"submitted": 0, "coalesced": 0, "rejected": 0, "done": 0, "failed": 0}
+
+    def _connection(self):
+        # One connection per thread and process, opened on first use, as in cache.Cache
+        connection = getattr(self._local, "connection", None)
+        if connection is None or self._local.pid != os.getpid():
+            os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+            connection = sqlite3.connect(self.path, timeout=30)
+            connection.execute("PRAGMA journal_mode=WAL")
+            with connection:
+                connection.execute("CREATE TABLE IF NOT EXISTS jobs ("
+                                   "id TEXT PRIMARY KEY, key TEXT, status TEXT, submitted REAL, "
+                                   "started REAL, finished REAL, result TEXT, error TEXT, pid INTEGER)")
+                connection.execute("CREATE INDEX IF NOT EXISTS jobs_key ON jobs (key, status)")
+            self._local.connection = connection
+            self._local.pid = os.getpid()
+        return connection
+
+    def _store(self, job):
+        if self.path:
+            with self._connection() as db:
+                db.execute("INSERT OR REPLACE INTO jobs VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                           (job["id"], job["key"], job["status"], job["submitted"], job["started"],
+                            job["finished"], json.dumps(job["result"]), job["error"], job["pid"]))
+
+    def _load(self, where, params):
+        with self._connection() as db:
+            row = db.execute(f"SELECT {', '.join(self.FIELDS)} FROM jobs WHERE {where}",
+                             params).fetchone()
+        if row is None:
+            return None
+        job = dict(zip(self.FIELDS, row))
+        job["result"] = json.loads(job["result"]) if job["result"] else None
+        if job["status"] in ("queued", "running") and not _alive(job["pid"]):
+            # The worker process that owned the job exited before finishing it
+            job.update(status="failed", finished=time.time(), error="the worker running this job exited")
+            self._store(job)
+        return job
+
+    def _ensure_workers(self):
+        # Caller holds the lock; threads do not survive a fork, so start them per process
+        if self._pid == os.getpid():
+            return
+        self._pid = os.getpid()
+        for number in range(self.workers):
+            threading.Thread(target=self._work, name=f"job-worker-{number}", daemon=True).start()
+
+    def submit(self, key, **payload):
+        """
+        Queue a job, or join the queued or running job with the same key.
+
+        Returns (job, created). Raises QueueFull when max_queued jobs wait.
+        """
+        now = time.time()
+        with self._lock:
+            job_id = self._inflight.get(key)
+            if job_id is not None:
+                self.counts["coalesced"] += 1
+                return dict(self._jobs[job_id]), False
+
+        if self.path:
+            # In flight in another worker process
+            job = self._load("key = ? AND status IN ('queued', 'running') AND submitted > ?",
+                             (key, now - self.retention))
+            if job is not None and job["status"] != "failed":
+                with self._lock:
+                    self.counts["coalesced"] += 1
+                return job, False
+
+        with self._lock:
+            if self._queue.qsize() >= self.max_queued:
+                self.counts["rejected"] += 1
+                raise QueueFull(f"{self.max_queued} jobs are already waiting")
+            self._ensure_workers()
+            job = {"id": uuid.uuid4().hex, "key": key, "status": "queued", "submitted": now,
+                   "started": None, "finished": None, "result": None, "error": None,
+                   "pid": os.getpid()}
+            self._jobs[job["id"]] = job
+            self._inflight[key] = job["id"]
+            self.counts["submitted"] += 1
+        self._expire(now)
+        self._store(job)
+        self._queue.put((job["id"], payload))
+        return dict(job), True
+
+    def _expire(self, now):
+        with self._lock:
+            for job_id in [job_id for job_id, job in self._jobs.items()
+                           if job["finished"] and job["finished"] < now - self.retention]:
+                del self._jobs[job_id]
+        if self.path:
+            with self._connection() as db:
+                db.execute("DELETE FROM jobs WHERE submitted < ?", (now - self.retention,))
+
+    def _work(self):
+        while True:
+            job_id, payload = self._queue.get()
+            with self._lock:
+                job = self._jobs[job_id]
+                job["status"] = "running"
+                job["started"] = time.time()
+                self._running += 1
+                self._waits.append(job["started"] - job["submitted"])
+
+            result, error = None, None
+            try:
+                self._store(job)
+                STAGE_SECONDS.observe(job["started"] - job["submitted"], stage="queue_wait")
+                result = self.run(**payload)
+            except Exception as e:
+                error = str(e) or type(e).__name__
+                ERRORS.inc(type=type(e).__name__)
+            finally:
+                # Always runs, so the worker survives and the key stops coalescing onto this job
+                self._finish(job, result, error)
+
+    def _finish(self, job, result, error):
+        with self._lock:
+            job["finished"] = time.time()
+            job["status"] = "failed" if error else "done"
+            job["result"], job["error"] = result, error
+            self._running -= 1
+            self._runtimes.append(job["finished"] - job["started"])
+            self._inflight.pop(job["key"], None)
+        STAGE_SECONDS.observe(job["finished"] - job["started"], stage="job")
+
+        try:
+            self._store(job)
+        except Exception as e:
+            # e.g. the database stayed locked or the result is not JSON-serializable
+            ERRORS.inc(type=type(e).__name__)
+            with self._lock:
+                job.update(status="failed", result=None, error=f"could not store the result: {e}")
+            try:
+                self._store(job)
+            except Exception:
+                pass
+        with self._lock:
+            self.counts[job["status"]] += 1
+
+    def get(self, job_id):
+        """The job record, or None if it is unknown or expired."""
+        with self._lock:
+            job = self._jobs.get(job_id)
+            if job is not None:
+                return dict(job)
+        if self.path:
+            return self._load("id = ?", (job_id,))
+        return None
+
+    def stats(self):
+        """Queue depth, job counts and queue wait / run time percentiles of this process."""
+        with self._lock:
+            return {
+                "queue_depth": self._queue.qsize(),
+                "running": self._running,
+                "workers": self.workers,
+                **self.counts,
+                "wait": _milliseconds(list(self._waits)),
+                "run": _milliseconds(list(self._runtimes)),
+            }
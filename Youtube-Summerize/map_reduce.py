@@ -0,0 +1,123 @@
+"""
+Map-reduce summarization of whole transcripts.
+
+The transcript is tokenized once and cut into windows that fit the model's
+input (map pass); all windows go through the pipeline as batched calls and
+their summaries are packed into windows and summarized again (reduce pass),
+repeating until they fit into a single window. Each pass takes a batch
+size and a number of batches run concurrently, so a long transcript costs a
+few batched forward passes rather than one sequential call per chunk.
+"""
+
+import os
+from concurrent.futures import ThreadPoolExecutor
+
+from metrics import STAGE_SECONDS
+from model_loader import GENERATION_KWARGS
+
+# Tokens per chunk (default: the model's input limit) and tokens shared by neighbouring chunks
+CHUNK_TOKENS = int(os.environ.get("SUMMARIZER_CHUNK_TOKENS", 0)) or None
+OVERLAP_TOKENS = int(os.environ.get("SUMMARIZER_CHUNK_OVERLAP", 32))
+if CHUNK_TOKENS is not None and CHUNK_TOKENS < GENERATION_KWARGS["max_length"]:
+    # A chunk could not hold even one summary, so the reduce pass would never shrink the text
+    raise ValueError(f"SUMMARIZER_CHUNK_TOKENS={CHUNK_TOKENS} is smaller than the summary length "
+                     f"({GENERATION_KWARGS['max_length']} tokens)")
+
+MAP_BATCH_SIZE = int(os.environ.get("SUMMARIZER_MAP_BATCH_SIZE", 8))
+MAP_CONCURRENCY = int(os.environ.get("SUMMARIZER_MAP_CONCURRENCY", 1))
+REDUCE_BATCH_SIZE = int(os.environ.get("SUMMARIZER_REDUCE_BATCH_SIZE", 4))
+REDUCE_CONCURRENCY = int(os.environ.get("SUMMARIZER_REDUCE_CONCURRENCY", 1))
+
+
+def chunk_limit(tokenizer, chunk_tokens=None):
+    """Content tokens per chunk: chunk_tokens, capped by the model input minus special tokens."""
+    limit = tokenizer.model_max_length - tokenizer.num_special_tokens_to_add()
+    return min(chunk_tokens, limit) if chunk_tokens else limit
+
+
+def chunk_text(tokenizer, text, max_tokens, overlap=OVERLAP_TOKENS):
+    """
+    Split text into pieces of at most max_tokens tokens.
+
+    Neighbouring pieces share overlap tokens so sentences cut at a boundary
+    appear whole in one of them. The last window is aligned to the end of
+    the text, so every piece of a long text is full length: batches need no
+    padding and no piece is too short to summarize.
+    """
+    with STAGE_SECONDS.time(stage="tokenize"):
+        ids = tokenizer(text, add_special_tokens=False, verbose=False)["input_ids"]
+    if len(ids) <= max_tokens:
+        return [text]
+
+    stride = max(max_tokens - overlap, 1)
+    starts = list(range(0, len(ids) - max_tokens, stride)) + [len(ids) - max_tokens]
+    return [tokenizer.decode(ids[start:start + max_tokens], skip_special_tokens=True)
+            for start in starts]
+
+
+def pack_texts(tokenizer, texts, max_tokens):
+    """Join consecutive texts into as few pieces of at most max_tokens tokens as possible."""
+    with STAGE_SECONDS.time(stage="tokenize"):
+        lengths = [len(tokenizer(text, add_special_tokens=False, verbose=False)["input_ids"])
+                   for text in texts]
+
+    pieces, current, size = [], [], 0
+    for text, length in zip(texts, lengths):
+        # +1 for the joining space
+        length += 1
+        if current and size + length > max_tokens:
+            pieces.append(" ".join(current))
+            current, size = [], 0
+        current.append(text)
+        size += length
+    pieces.append(" ".join(current))
+    return pieces
+
+
+def summarize_batched(summarizer, texts, batch_size, concurrency, **generation_kwargs):
+    """Summarize texts in batches of batch_size, running up to concurrency batches at once."""
+    batches = [texts[i:i + batch_size] for i in range(0, len(texts), batch_size)]
+
+    def run(batch):
+        outputs = summarizer(batch, batch_size=len(batch), truncation=True, **generation_kwargs)
+        return [output["summary_text"] for output in outputs]
+
+    if concurrency > 1 and len(batches) > 1:
+        with ThreadPoolExecutor(max_workers=concurrency) as pool:
+            results = list(pool.map(run, batches))
+    else:
+        results = [run(batch) for batch in batches]
+    return [summary for batch in results for summary in batch]
+
+
+def summarize_transcript(summarizer, text, chunk_tokens=CHUNK_TOKENS,
+                         map_batch_size=MAP_BATCH_SIZE, map_concurrency=MAP_CONCURRENCY,
+                         reduce_batch_size=REDUCE_BATCH_SIZE, reduce_concurrency=REDUCE_CONCURRENCY,
+                         generation_kwargs=GENERATION_KWARGS):
+    """
+    Summarize a transcript of any length; returns (summary, number of map chunks).
+
+    summarizer is a summarization pipeline (anything callable like one and
+    carrying its tokenizer).
+    """
+    tokenizer = summarizer.tokenizer
+    max_tokens = chunk_limit(tokenizer, chunk_tokens)
+
+    chunks = chunk_text(tokenizer, text, max_tokens)
+    if len(chunks) == 1:
+        return summarize_batched(summarizer, chunks, 1, 1, **generation_kwargs)[0], 1
+
+    summaries = summarize_batched(summarizer, chunks, map_batch_size, map_concurrency,
+                                  **generation_kwargs)
+    # Reduce until the summaries fit into one window; summaries are usually much shorter
+    # than their inputs, so every round shrinks the text
+    while True:
+        pieces = pack_texts(tokenizer, summaries, max_tokens)
+        if 1 < len(summaries) <= len(pieces):
+            # No two summaries fit into one window: merge them in pairs (the pipeline
+            # truncates the input) so every round still halves the number of pieces
+            pieces = [" ".join(summaries[i:i + 2]) for i in range(0, len(summaries), 2)]
+        summaries = summarize_batched(summarizer, pieces, reduce_batch_size, reduce_concurrency,
+                                      **generation_kwargs)
+        if len(pieces) == 1:
+            return summaries[0], len(chunks)
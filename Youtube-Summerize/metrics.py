@@ -0,0 +1,264 @@
+"""
+Prometheus metrics for the summarizer, without third-party dependencies.
+
+Counters, gauges and histograms are defined once here and updated from
+the hot path (fetch, tokenization, generation, rendering, model loading).
+The registry renders the Prometheus text exposition format for /metrics.
+
+gunicorn workers are separate processes, so with METRICS_DIR set every
+process writes a snapshot of its metrics to <METRICS_DIR>/<pid>.json every
+couple of seconds, and /metrics adds up the snapshots of all workers.
+Counters and histograms of exited workers are kept so totals never go
+backwards; gauges only count live processes.
+"""
+
+import glob
+import json
+import os
+import tempfile
+import threading
+import time
+from contextlib import contextmanager
+
+METRICS_DIR = os.environ.get("METRICS_DIR")
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60, 120, 300)
+
+
+def _labels_key(labelnames, labels):
+    if set(labels) != set(labelnames):
+        raise ValueError(f"Expected labels {labelnames}, got {sorted(labels)}")
+    return json.dumps([str(labels[name]) for name in labelnames])
+
+
+def _escape(value):
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _format_labels(labelnames, key, extra=()):
+    pairs = list(zip(labelnames, json.loads(key))) + list(extra)
+    if not pairs:
+        return ""
+    return "{" + ",".join(f'{name}="{_escape(value)}"' for name, value in pairs) + "}"
+
+
+class _Metric:
+    kind = None
+
+    def __init__(self, name, documentation, labelnames=(), registry=None):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._values = {}
+        self._lock = threading.Lock()
+        self.registry = registry or REGISTRY
+        self.registry.register(self)
+
+    def snapshot(self):
+        with self._lock:
+            return {key: list(value) if isinstance(value, list) else value
+                    for key, value in self._values.items()}
+
+
+class Counter(_Metric):
+    """Monotonic total."""
+
+    kind = "counter"
+
+    def inc(self, amount=1, **labels):
+        key = _labels_key(self.labelnames, labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+        self.registry.touch()
+
+    @staticmethod
+    def merge(values, other):
+        for key, value in other.items():
+            values[key] = values.get(key, 0) + value
+
+    def render(self, values):
+        return [f"{self.name}{_format_labels(self.labelnames, key)} {value}"
+                for key, value in sorted(values.items())]
+
+
+class Gauge(Counter):
+    """Current value, set directly; summed across live processes."""
+
+    kind = "gauge"
+
+    def set(self, value, **labels):
+        key = _labels_key(self.labelnames, labels)
+        with self._lock:
+            self._values[key] = value
+        self.registry.touch()
+
+
+class Histogram(_Metric):
+    """Distribution of observed values over fixed buckets, with their sum and count."""
+
+    kind = "histogram"
+
+    def __init__(self, name, documentation, labelnames=(), buckets=LATENCY_BUCKETS, registry=None):
+        self.buckets = tuple(buckets)
+        super().__init__(name, documentation, labelnames, registry)
+
+    def observe(self, value, **labels):
+        key = _labels_key(self.labelnames, labels)
+        with self._lock:
+            # Per-bucket (non-cumulative) counts, then sum and count
+            state = self._values.setdefault(key, [0] * (len(self.buckets) + 3))
+            for index, bound in enumerate(self.buckets):
+                if value <= bound:
+                    state[index] += 1
+                    break
+            else:
+                state[len(self.buckets)] += 1
+            state[-2] += value
+            state[-1] += 1
+        self.registry.touch()
+
+    @contextmanager
+    def time(self, **labels):
+        """Observe the wall time of the with-block."""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - start, **labels)
+
+    @staticmethod
+    def merge(values, other):
+        for key, state in other.items():
+            if key in values:
+                values[key] = [a + b for a, b in zip(values[key], state)]
+            else:
+                values[key] = list(state)
+
+    def render(self, values):
+        lines = []
+        for key, state in sorted(values.items()):
+            cumulative = 0
+            for bound, count in zip(self.buckets + (float("inf"),), state):
+                cumulative += count
+                le = "+Inf" if bound == float("inf") else repr(float(bound))
+                lines.append(f"{self.name}_bucket"
+                             f"{_format_labels(self.labelnames, key, [('le', le)])} {cumulative}")
+            labels = _format_labels(self.labelnames, key)
+            lines.append(f"{self.name}_sum{labels} {state[-2]}")
+            lines.append(f"{self.name}_count{labels} {state[-1]}")
+        return lines
+
+
+class Registry:
+    """Holds the metrics, renders them and shares them between processes via METRICS_DIR."""
+
+    def __init__(self, directory=METRICS_DIR, flush_interval=2.0):
+        self.directory = directory
+        self.flush_interval = flush_interval
+        self.metrics = []
+        self.collectors = []
+        self._dirty = threading.Event()
+        self._lock = threading.Lock()
+        self._pid = None
+
+    def register(self, metric):
+        self.metrics.append(metric)
+
+    def add_collector(self, collect):
+        """Call collect() before every snapshot, e.g. to set gauges from component state."""
+        self.collectors.append(collect)
+
+    def touch(self):
+        if not self.directory:
+            return
+        self._dirty.set()
+        # The flusher thread does not survive a fork, so each process starts its own
+        if self._pid != os.getpid():
+            with self._lock:
+                if self._pid != os.getpid():
+                    self._pid = os.getpid()
+                    threading.Thread(target=self._flush_loop, name="metrics-flusher",
+                                     daemon=True).start()
+
+    def _flush_loop(self):
+        while True:
+            self._dirty.wait()
+            time.sleep(self.flush_interval)
+            self.flush()
+            # After the flush: collectors setting gauges during it must not schedule another one
+            self._dirty.clear()
+
+    def snapshot(self):
+        for collect in self.collectors:
+            collect()
+        return {metric.name: metric.snapshot() for metric in self.metrics}
+
+    def flush(self):
+        """Write this process's snapshot to <directory>/<pid>.json."""
+        os.makedirs(self.directory, exist_ok=True)
+        fd, temporary = tempfile.mkstemp(dir=self.directory, suffix=".tmp")
+        with os.fdopen(fd, "w") as f:
+            json.dump(self.snapshot(), f)
+        os.replace(temporary, os.path.join(self.directory, f"{os.getpid()}.json"))
+
+    def _snapshots(self):
+        own = self.snapshot()
+        if not self.directory:
+            return [(own, True)]
+        snapshots = [(own, True)]
+        for path in glob.glob(os.path.join(self.directory, "*.json")):
+            pid = int(os.path.basename(path).split(".")[0])
+            if pid == os.getpid():
+                continue
+            try:
+                with open(path) as f:
+                    snapshot = json.load(f)
+            except (OSError, ValueError):
+                continue
+            try:
+                os.kill(pid, 0)
+                alive = True
+            except ProcessLookupError:
+                alive = False
+            except PermissionError:
+                alive = True
+            snapshots.append((snapshot, alive))
+        return snapshots
+
+    def render(self):
+        """All metrics in the Prometheus text format, summed over processes."""
+        snapshots = self._snapshots()
+        lines = []
+        for metric in self.metrics:
+            values = {}
+            for snapshot, alive in snapshots:
+                if metric.kind == "gauge" and not alive:
+                    continue
+                metric.merge(values, snapshot.get(metric.name, {}))
+            lines.append(f"# HELP {metric.name} {metric.documentation}")
+            lines.append(f"# TYPE {metric.name} {metric.kind}")
+            lines.extend(metric.render(values))
+        return "\n".join(lines) + "\n"
+
+
+REGISTRY = Registry()
+
+STAGE_SECONDS = Histogram("summarizer_stage_seconds",
+                          "Time spent per stage: fetch, tokenize, generate, render, queue_wait, job, "
+                          "model_load, warmup",
+                          ["stage"])
+HTTP_SECONDS = Histogram("summarizer_http_request_seconds", "HTTP request latency by endpoint",
+                         ["endpoint", "status"])
+INPUT_TOKENS = Counter("summarizer_input_tokens_total", "Tokens fed to the model")
+OUTPUT_TOKENS = Counter("summarizer_output_tokens_total", "Tokens generated by the model")
+TOKENS_PER_SECOND = Histogram("summarizer_generate_tokens_per_second",
+                              "Generated tokens per second of each generate call",
+                              buckets=(1, 5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000))
+BATCH_SIZE = Histogram("summarizer_batch_size", "Texts per generate call",
+                       buckets=(1, 2, 4, 8, 16, 32, 64))
+CACHE_REQUESTS = Counter("summarizer_cache_requests_total", "Cache lookups by namespace and result",
+                         ["namespace", "result"])
+ERRORS = Counter("summarizer_errors_total", "Failed jobs and requests by exception type", ["type"])
+QUEUE_DEPTH = Gauge("summarizer_job_queue_depth", "Jobs waiting for a worker")
+JOBS_RUNNING = Gauge("summarizer_jobs_running", "Jobs being processed")
+WORKERS_READY = Gauge("summarizer_workers_ready", "Processes whose model is loaded and warmed up")
@@ -0,0 +1,184 @@
+"""
+Loading of the summarization model outside the request path.
+
+The model is built by a background thread, so a worker serves the index
+page (and its health check) straight away and only summaries wait for the
+model. Under gunicorn with preload_app the master process loads the model
+once before forking instead, and every worker shares those weights
+copy-on-write; each worker then only runs its own warm-up inference.
+
+The inference backend is chosen by configuration (SUMMARIZER_BACKEND):
+"torch" (float32, the default), "quantized" (dynamic int8 quantization of
+the Linear layers) or "onnx" (an exported graph run by ONNX Runtime through
+optimum). Every backend returns a transformers summarization pipeline, so
+callers use it the same way. SUMMARIZER_THREADS caps the intra-op threads.
+"""
+
+import os
+import threading
+import time
+
+from metrics import STAGE_SECONDS, WORKERS_READY
+
+MODEL_NAME = os.environ.get("SUMMARIZER_MODEL", "sshleifer/distilbart-cnn-12-6")
+BACKEND = os.environ.get("SUMMARIZER_BACKEND", "torch")
+NUM_THREADS = int(os.environ.get("SUMMARIZER_THREADS", 0)) or None
+
+# Exported ONNX graphs, reused across restarts
+ONNX_DIR = os.environ.get("SUMMARIZER_ONNX_DIR",
+                          os.path.join(os.path.dirname(os.path.abspath(__file__)), ".cache", "onnx"))
+
+# Generation settings of the summaries served by the app
+GENERATION_KWARGS = {"max_length": 150, "min_length": 30, "do_sample": False}
+
+WARMUP_TEXT = ("The warm-up pass runs one short summary through the model so that "
+               "the first real request does not pay for lazy initialization.")
+
+
+class ModelNotReady(Exception):
+    """Raised when the model is requested before it has finished loading."""
+
+
+# Heavy imports live inside the builders so that importing the app does not pull in torch
+
+def _torch_pipeline(model_name, threads):
+    import torch
+    from transformers import pipeline
+
+    if threads:
+        torch.set_num_threads(threads)
+    return pipeline("summarization", model=model_name)
+
+
+def _quantized_pipeline(model_name, threads):
+    import torch
+    from transformers import AutoModelForSeq2SeqLM, AutoTokenizer, pipeline
+
+    if threads:
+        torch.set_num_threads(threads)
+    model = AutoModelForSeq2SeqLM.from_pretrained(model_name).eval()
+    # Linear layers hold almost all of the weights and FLOPs; int8 weights, activations
+    # quantized on the fly
+    model = torch.ao.quantization.quantize_dynamic(model, {torch.nn.Linear}, dtype=torch.qint8)
+    return pipeline("summarization", model=model, tokenizer=AutoTokenizer.from_pretrained(model_name))
+
+
+def _onnx_pipeline(model_name, threads):
+    import onnxruntime
+    from optimum.onnxruntime import ORTModelForSeq2SeqLM
+    from transformers import AutoTokenizer, pipeline
+
+    options = onnxruntime.SessionOptions()
+    if threads:
+        options.intra_op_num_threads = threads
+        options.inter_op_num_threads = 1
+
+    # Export once; later loads read the saved graph
+    export_dir = os.path.join(ONNX_DIR, model_name.replace("/", "--"))
+    if os.path.isdir(export_dir):
+        model = ORTModelForSeq2SeqLM.from_pretrained(export_dir, session_options=options)
+    else:
+        model = ORTModelForSeq2SeqLM.from_pretrained(model_name, export=True, session_options=options)
+        model.save_pretrained(export_dir)
+    return pipeline("summarization", model=model, tokenizer=AutoTokenizer.from_pretrained(model_name))
+
+
+BACKENDS = {
+    "torch": _torch_pipeline,
+    "quantized": _quantized_pipeline,
+    "onnx": _onnx_pipeline,
+}
+
+
+def load_summarizer(model_name=MODEL_NAME, backend=BACKEND, threads=NUM_THREADS):
+    """Build the summarization pipeline on the given backend (see BACKENDS)."""
+    if backend not in BACKENDS:
+        raise ValueError(f"Unknown summarizer backend '{backend}', expected one of {list(BACKENDS)}")
+    return BACKENDS[backend](model_name, threads)
+
+
+class ModelLoader:
+    """
+    Holds the summarization pipeline and tracks its loading state.
+
+    factory() builds the pipeline. load() does so in the calling thread,
+    start() in a background thread followed by a warm-up inference; the
+    model counts as ready once the warm-up has finished.
+    """
+
+    def __init__(self, factory=load_summarizer, warmup_text=WARMUP_TEXT):
+        self.factory = factory
+        self.warmup_text = warmup_text
+        self.model = None
+        self.error = None
+        self.load_seconds = None
+        self.warmup_seconds = None
+        self._ready = threading.Event()
+        # Set once loading has succeeded or failed, so waiters don't sit out their timeout
+        self._finished = threading.Event()
+        self._lock = threading.Lock()
+        self._started = False
+
+    def load(self):
+        """Build the pipeline now (no warm-up); returns it."""
+        if self.model is None:
+            start = time.perf_counter()
+            self.model = self.factory()
+            self.load_seconds = time.perf_counter() - start
+        return self.model
+
+    def warm_up(self):
+        start = time.perf_counter()
+        self.model(self.warmup_text, max_length=20, min_length=5, do_sample=False)
+        self.warmup_seconds = time.perf_counter() - start
+
+    def _run(self):
+        try:
+            self.load()
+            self.warm_up()
+        except Exception as e:
+            self.error = f"{type(e).__name__}: {e}"
+            print(f"Model failed to load: {self.error}")
+            self._finished.set()
+            return
+        self._ready.set()
+        self._finished.set()
+        # Recorded by the process that serves, also when the load itself happened in the master
+        STAGE_SECONDS.observe(self.load_seconds, stage="model_load")
+        STAGE_SECONDS.observe(self.warmup_seconds, stage="warmup")
+        WORKERS_READY.set(1)
+        print(f"Model ready (load {self.load_seconds:.1f}s, warm-up {self.warmup_seconds:.2f}s)")
+
+    def start(self):
+        """Load (if needed) and warm up in a background thread; safe to call repeatedly."""
+        with self._lock:
+            if self._started:
+                return
+            self._started = True
+        threading.Thread(target=self._run, name="model-loader", daemon=True).start()
+
+    @property
+    def ready(self):
+        return self._ready.is_set()
+
+    def get(self, timeout=0):
+        """Return the pipeline, waiting up to timeout seconds; raises ModelNotReady."""
+        self._finished.wait(timeout)
+        if not self.ready:
+            raise ModelNotReady(self.error or "model is still loading")
+        return self.model
+
+    def status(self):
+        if self.ready:
+            state = "ready"
+        elif self.error:
+            state = "failed"
+        else:
+            state = "loading"
+        return {
+            "status": state,
+            "pid": os.getpid(),
+            "load_seconds": self.load_seconds,
+            "warmup_seconds": self.warmup_seconds,
+            "error": self.error,
+        }
@@ -0,0 +1,74 @@
+"""
+Transcript fetchers.
+
+The app only depends on the fetch(video_id, language) interface, so the
+YouTube client can be swapped for a directory of local transcript files
+(set TRANSCRIPT_DIR) when developing or testing without network access,
+and either one can be wrapped in a cache.
+"""
+
+import os
+
+
+class TranscriptUnavailable(Exception):
+    """Raised when a video has no transcript in the requested language."""
+
+
+class TranscriptFetcher:
+    """Interface: fetch(video_id, language) returns the transcript as one string."""
+
+    def fetch(self, video_id, language="en"):
+        raise NotImplementedError
+
+
+class YouTubeTranscriptFetcher(TranscriptFetcher):
+    """Fetches transcripts from YouTube with youtube_transcript_api."""
+
+    def fetch(self, video_id, language="en"):
+        from youtube_transcript_api import (CouldNotRetrieveTranscript, TranscriptsDisabled,
+                                            YouTubeTranscriptApi)
+
+        try:
+            transcript = YouTubeTranscriptApi().fetch(video_id, languages=[language]).to_raw_data()
+        except TranscriptsDisabled:
+            raise TranscriptUnavailable("transcript disabled for this video")
+        except CouldNotRetrieveTranscript:
+            raise TranscriptUnavailable("no transcript available for this video")
+        return " ".join([entry['text'] for entry in transcript])
+
+
+class DirectoryTranscriptFetcher(TranscriptFetcher):
+    """Reads transcripts from <directory>/<video_id>.<language>.txt."""
+
+    def __init__(self, directory):
+        self.directory = directory
+
+    def fetch(self, video_id, language="en"):
+        directory = os.path.realpath(self.directory)
+        path = os.path.realpath(os.path.join(directory, f"{video_id}.{language}.txt"))
+        if os.path.dirname(path) != directory:
+            # video_id or language tried to leave the directory (e.g. "../")
+            raise TranscriptUnavailable("no transcript available for this video")
+        try:
+            with open(path, encoding="utf-8") as f:
+                return f.read()
+        except FileNotFoundError:
+            raise TranscriptUnavailable("no transcript available for this video")
+
+
+class CachedTranscriptFetcher(TranscriptFetcher):
+    """Serves transcripts from a cache.Cache, keyed by video ID and language."""
+
+    def __init__(self, fetcher, cache):
+        self.fetcher = fetcher
+        self.cache = cache
+
+    def fetch(self, video_id, language="en"):
+        return self.cache.get_or_compute("transcript", f"{video_id}:{language}",
+                                         lambda: self.fetcher.fetch(video_id, language))
+
+
+def default_fetcher():
+    """The local directory fetcher if TRANSCRIPT_DIR is set, otherwise YouTube."""
+    directory = os.environ.get("TRANSCRIPT_DIR")
+    return DirectoryTranscriptFetcher(directory) if directory else YouTubeTranscriptFetcher()
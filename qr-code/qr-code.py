@@ -1,8 +1,11 @@
-import qrcode
+import io
+import multiprocessing
+import os
+import tempfile
 import streamlit as st
-from io import BytesIO
-from PIL import Image
-import numpy as np
+from qr_bulk import generate_bulk, read_payloads
+from qr_cache import RenderCache, cache_key
+from qr_generator import ERROR_CORRECTION, MIME_TYPES, render_qr
 
 # Initialize session state for reset functionality
 if 'reset' not in st.session_state:
@@ -21,6 +24,7 @@ def reset_settings():
     st.session_state.box_size = 10
     st.session_state.border = 4
     st.session_state.auto_version = True
+    st.session_state.output_format = "PNG"
     st.session_state.animated = False
     st.session_state.frames = 5
     st.session_state.duration = 200
@@ -53,6 +57,9 @@ with st.form("qr_form"):
         box_size = st.slider("Module Size", 5, 20, 10, key="box_size")
         border = st.slider("Border Width", 1, 10, 4, key="border")
         auto_version = st.checkbox("Auto Version", True, key="auto_version")
+        output_format = st.selectbox("Output Format", ["PNG", "SVG", "PDF"], index=0,
+                                     key="output_format",
+                                     help="SVG and PDF are vector formats for print")
     
     st.subheader("🎥 Animation Options")
     animated = st.checkbox("Generate Animated QR Code", False, key="animated")
@@ -66,28 +73,17 @@ with st.form("qr_form"):
 
     generate = st.form_submit_button(" Generate QR Code")
 
-# Error correction mapping
-ec_mapping = {
-    "L (Low)": qrcode.constants.ERROR_CORRECT_L,
-    "M (Medium)": qrcode.constants.ERROR_CORRECT_M,
-    "Q (Quartile)": qrcode.constants.ERROR_CORRECT_Q,
-    "H (High)": qrcode.constants.ERROR_CORRECT_H,
-}
-
-def generate_animated_qr(data, base_color, frames=5, duration=200, **kwargs):
-    images = []
-    for i in range(frames):
-        # Create color gradient
-        hue = (i / frames) * 360
-        frame_color = f"hsl({hue}, 100%, 50%)"
-        
-        qr = qrcode.QRCode(**kwargs)
-        qr.add_data(data)
-        qr.make(fit=kwargs.get('version', None))
-        
-        img = qr.make_image(fill_color=frame_color, back_color=base_color)
-        images.append(img.get_image())
-    return images, duration
+# Rendered images shared by all sessions and kept on disk across restarts
+@st.cache_resource
+def get_render_cache():
+    return RenderCache(directory=os.path.join(os.path.dirname(os.path.abspath(__file__)),
+                                              ".cache", "renders"))
+
+render_cache = get_render_cache()
+
+# Error correction level from its label, e.g. "M (Medium)"
+def error_correction_level():
+    return ERROR_CORRECTION[st.session_state.error_correction[0]]
 
 if generate:
     if not data:
@@ -96,49 +92,34 @@ if generate:
         try:
             qr_params = {
                 'version': None if st.session_state.auto_version else 1,
-                'error_correction': ec_mapping[st.session_state.error_correction],
+                'error_correction': error_correction_level(),
                 'box_size': st.session_state.box_size,
                 'border': st.session_state.border
             }
 
             if animated:
-                # Generate animated QR code
-                frames, duration = generate_animated_qr(
-                    data,
-                    st.session_state.back_color,
-                    frames=st.session_state.frames,
-                    duration=st.session_state.duration,
-                    **qr_params
-                )
-                
-                # Save as GIF
-                buf = BytesIO()
-                frames[0].save(buf, 
-                               format='GIF', 
-                               save_all=True, 
-                               append_images=frames[1:], 
-                               duration=duration, 
-                               loop=0)
-                qr_img = buf.getvalue()
-                
+                render_options = dict(output_format="gif",
+                                      back_color=st.session_state.back_color,
+                                      frames=st.session_state.frames,
+                                      duration=st.session_state.duration,
+                                      **qr_params)
                 file_name = "animated_qrcode.gif"
-                mime_type = "image/gif"
             else:
-                # Generate static QR code
-                qr = qrcode.QRCode(**qr_params)
-                qr.add_data(data)
-                qr.make(fit=st.session_state.auto_version)
-                
-                img = qr.make_image(fill_color=st.session_state.fill_color, 
-                                  back_color=st.session_state.back_color)
-                
-                # Convert to bytes
-                buf = BytesIO()
-                img.save(buf, format="PNG")
-                qr_img = buf.getvalue()
-                
-                file_name = "custom_qrcode.png"
-                mime_type = "image/png"
+                render_options = dict(fill_color=st.session_state.fill_color,
+                                      back_color=st.session_state.back_color,
+                                      output_format=st.session_state.output_format.lower(),
+                                      **qr_params)
+                file_name = f"custom_qrcode.{render_options['output_format']}"
+            mime_type = MIME_TYPES[render_options['output_format']]
+
+            # Generate the QR code, or serve identical settings from the cache
+            def render():
+                image, version = render_qr(data, **render_options)
+                return image, {'version': version}
+
+            render_key = cache_key(data=data, **render_options)
+            qr_img, qr_meta = render_cache.get_or_render(render_key, render)
+            qr_version = qr_meta.get('version')
 
             # Display results
             st.success(" QR Code Generated Successfully!")
@@ -154,17 +135,94 @@ if generate:
                 )
                 
                 st.markdown("** Technical Details**")
-                st.write(f"Format: {'Animated GIF' if animated else 'PNG'}")
+                st.write(f"Format: {'Animated GIF' if animated else st.session_state.output_format}")
                 if animated:
                     st.write(f"Frames: {st.session_state.frames}")
                     st.write(f"Duration: {st.session_state.duration}ms per frame")
-                st.write(f"Version: {qr.version if 'qr' in locals() else 'Auto'}")
+                st.write(f"Version: {qr_version or 'Auto'}")
                 st.write(f"Error Correction: {st.session_state.error_correction.split()[0]}")
                 st.write(f"Module Size: {st.session_state.box_size}px")
                 st.write(f"Border Width: {st.session_state.border} modules")
                 
             with col_right:
-                st.image(qr_img, caption="Powered by You", use_column_width=True)
+                if mime_type == "application/pdf":
+                    st.info("Vector PDF ready for download (no inline preview).")
+                elif mime_type == "image/svg+xml":
+                    st.image(qr_img.decode("utf-8"), caption="Powered by You", use_column_width=True)
+                else:
+                    st.image(qr_img, caption="Powered by You", use_column_width=True)
             
         except Exception as e:
             st.error(f" Error generating QR code: {str(e)}")
+
+# Bulk generation section
+st.subheader("📦 Bulk Generation")
+st.markdown("Upload a CSV with one payload per row to generate a ZIP of codes "
+            "using the options above.")
+
+bulk_file = st.file_uploader("Payload CSV", type=["csv"])
+bulk_col1, bulk_col2 = st.columns(2)
+with bulk_col1:
+    bulk_column = st.text_input("Payload Column", value="data")
+with bulk_col2:
+    bulk_name_column = st.text_input("Name Column (optional)", value="")
+
+if bulk_file is not None and st.button(" Generate Bulk QR Codes"):
+    bulk_options = {
+        'fill_color': st.session_state.fill_color,
+        'back_color': st.session_state.back_color,
+        'output_format': st.session_state.output_format.lower(),
+        'version': None if st.session_state.auto_version else 1,
+        'error_correction': error_correction_level(),
+        'box_size': st.session_state.box_size,
+        'border': st.session_state.border,
+    }
+    progress_bar = st.progress(0, text="Generating...")
+
+    def report_bulk_progress(done, failed):
+        progress_bar.progress(min(done / max(bulk_rows, 1), 1.0),
+                              text=f"{done:,} of {bulk_rows:,} processed, {failed:,} failed")
+
+    # The archive is streamed to a temporary file rather than built in memory
+    bulk_output = tempfile.NamedTemporaryFile(suffix=".zip", delete=False)
+    bulk_output.close()
+    try:
+        bulk_text = io.TextIOWrapper(bulk_file, encoding="utf-8", newline="")
+        bulk_rows = max(sum(1 for _ in bulk_text) - 1, 0)
+        bulk_text.seek(0)
+
+        report = generate_bulk(
+            read_payloads(bulk_text, bulk_column, bulk_name_column or None),
+            bulk_output.name,
+            bulk_options,
+            progress=report_bulk_progress,
+            mp_context=multiprocessing.get_context("spawn"),
+            cache=render_cache,
+        )
+        bulk_text.detach()
+
+        st.success(f" {report['succeeded']:,} of {report['total']:,} QR codes generated")
+        if report['failures']:
+            st.warning(f" {len(report['failures']):,} rows failed; see errors.csv in the archive")
+
+        with open(bulk_output.name, "rb") as archive:
+            st.download_button(
+                label=" Download QR Archive",
+                data=archive,
+                file_name="qrcodes.zip",
+                mime="application/zip",
+            )
+    except ValueError as e:
+        st.error(f" Error generating QR codes: {str(e)}")
+    finally:
+        os.remove(bulk_output.name)
+
+with st.expander("Render Cache Statistics"):
+    cache_stats = render_cache.stats()
+    stat_col1, stat_col2, stat_col3 = st.columns(3)
+    stat_col1.metric("Hits", cache_stats['hits_memory'] + cache_stats['hits_disk'])
+    stat_col2.metric("Misses", cache_stats['misses'])
+    stat_col3.metric("Hit Rate", f"{cache_stats['hit_rate']:.0%}")
+    st.write(f"Memory tier: {cache_stats['memory_entries']} entries, "
+             f"{cache_stats['memory_bytes'] / 2 ** 20:.1f} MiB")
+    st.write(f"Disk tier: {cache_stats['disk_bytes'] / 2 ** 20:.1f} MiB")
@@ -0,0 +1,183 @@
+"""
+Bulk QR code generation: CSV of payloads in, ZIP of PNG/SVG/PDF codes out.
+
+Encoding and rendering are spread over a process pool. Only a bounded
+number of items is in flight at once and every image is written into the ZIP
+archive as soon as it finishes, so memory does not grow with the batch size.
+Items that fail are recorded in errors.csv inside the archive instead of
+aborting the batch.
+
+Usage:
+    python qr_bulk.py payloads.csv -o codes.zip --column data --name-column name
+"""
+
+import argparse
+import csv
+import io
+import os
+import re
+import sys
+import zipfile
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+
+from qr_cache import RenderCache, cache_key
+from qr_generator import ERROR_CORRECTION, OUTPUT_FORMATS, generate_static_qr
+
+ERRORS_FILE = "errors.csv"
+
+
+def read_payloads(csv_file, column="data", name_column=None):
+    """
+    Yield (name, data) pairs from a CSV file object, one row at a time.
+
+    Rows without a name column value are named after their row number.
+    """
+    reader = csv.DictReader(csv_file)
+    if reader.fieldnames is None or column not in reader.fieldnames:
+        raise ValueError(f"CSV has no '{column}' column.")
+
+    for row_number, row in enumerate(reader, start=1):
+        name = row.get(name_column) if name_column else None
+        yield name or f"row_{row_number:06d}", row[column]
+
+
+def archive_name(index, name, extension="png"):
+    """Make a unique, filesystem-safe file name for an archive entry."""
+    safe = re.sub(r"[^A-Za-z0-9._-]+", "_", name).strip("._") or "qr"
+    return f"{index:06d}_{safe[:80]}.{extension}"
+
+
+def render_item(index, name, data, options):
+    """Worker entry point: returns (index, name, image or None, version or None, error or None)."""
+    try:
+        if not data:
+            raise ValueError("empty payload")
+        image, version = generate_static_qr(data, **options)
+        return index, name, image, version, None
+    except Exception as e:
+        return index, name, None, None, f"{type(e).__name__}: {e}"
+
+
+def generate_bulk(payloads, output, options, workers=None, max_in_flight=None,
+                  progress=None, mp_context=None, cache=None):
+    """
+    Render every payload in a process pool and stream the images into a ZIP.
+
+    payloads is an iterable of (name, data) pairs and is consumed lazily;
+    options are passed to generate_static_qr (colors, output_format and
+    QRCode arguments).
+    progress, if given, is called as progress(done, failed) after every item.
+    With a RenderCache, cached images skip the pool and new ones are stored.
+    Returns a report dict with the counts and the list of failures.
+    """
+    options = {"output_format": "png", **options}
+    extension = options["output_format"]
+    workers = workers or os.cpu_count() or 1
+    max_in_flight = max_in_flight or workers * 4
+    failures = []
+    done = 0
+
+    with zipfile.ZipFile(output, "w", compression=zipfile.ZIP_STORED) as archive, \
+            ProcessPoolExecutor(max_workers=workers, mp_context=mp_context) as pool:
+
+        def record(index, name, image, error):
+            nonlocal done
+            if error is None:
+                # PNG and PDF output is already deflated; storing avoids compressing twice
+                archive.writestr(archive_name(index, name, extension), image)
+            else:
+                failures.append((index, name, error))
+            done += 1
+            if progress is not None:
+                progress(done, len(failures))
+
+        def drain(pending, block_until):
+            finished, pending = wait(pending, return_when=block_until)
+            for future in finished:
+                index, name, image, version, error = future.result()
+                key = keys.pop(index, None)
+                if error is None and key is not None:
+                    # Same metadata as the page stores, so its cache hits show the version
+                    cache.put(key, image, {'version': version})
+                record(index, name, image, error)
+            return pending
+
+        pending = set()
+        keys = {}
+        for index, (name, data) in enumerate(payloads, start=1):
+            if cache is not None:
+                key = cache_key(data=data, **options)
+                cached = cache.get(key)
+                if cached is not None:
+                    record(index, name, cached[0], None)
+                    continue
+                keys[index] = key
+
+            pending.add(pool.submit(render_item, index, name, data, options))
+            if len(pending) >= max_in_flight:
+                pending = drain(pending, FIRST_COMPLETED)
+        while pending:
+            pending = drain(pending, FIRST_COMPLETED)
+
+        if failures:
+            report = io.StringIO()
+            writer = csv.writer(report)
+            writer.writerow(["row", "name", "error"])
+            writer.writerows(sorted(failures))
+            archive.writestr(ERRORS_FILE, report.getvalue())
+
+    return {"total": done, "succeeded": done - len(failures), "failures": sorted(failures)}
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Generate QR codes in bulk from a CSV file.")
+    parser.add_argument("csv", help="CSV file with one payload per row ('-' for stdin)")
+    parser.add_argument("-o", "--output", required=True, help="ZIP archive to write")
+    parser.add_argument("--column", default="data", help="Column holding the payloads")
+    parser.add_argument("--name-column", help="Column used to name the image files")
+    parser.add_argument("--error-correction", choices=list(ERROR_CORRECTION), default="L")
+    parser.add_argument("--version", type=int, help="Fixed QR version (default: auto)")
+    parser.add_argument("--box-size", type=int, default=10)
+    parser.add_argument("--border", type=int, default=4)
+    parser.add_argument("--fill-color", default="#000000")
+    parser.add_argument("--back-color", default="#FFFFFF")
+    parser.add_argument("--format", choices=list(OUTPUT_FORMATS), default="png",
+                        help="Image format of the archive entries")
+    parser.add_argument("--workers", type=int, help="Worker processes (default: CPU count)")
+    parser.add_argument("--cache-dir", help="Reuse and store rendered images in this directory")
+    args = parser.parse_args(argv)
+
+    options = {
+        "fill_color": args.fill_color,
+        "back_color": args.back_color,
+        "output_format": args.format,
+        "version": args.version,
+        "error_correction": ERROR_CORRECTION[args.error_correction],
+        "box_size": args.box_size,
+        "border": args.border,
+    }
+
+    def report_progress(done, failed):
+        if done % 1000 == 0:
+            print(f"{done} processed, {failed} failed", file=sys.stderr)
+
+    source = sys.stdin if args.csv == "-" else open(args.csv, newline="", encoding="utf-8")
+    with source:
+        payloads = read_payloads(source, args.column, args.name_column)
+        cache = RenderCache(directory=args.cache_dir) if args.cache_dir else None
+        report = generate_bulk(payloads, args.output, options, args.workers,
+                               progress=report_progress, cache=cache)
+
+    print(f"{report['succeeded']} of {report['total']} QR codes written to {args.output}",
+          file=sys.stderr)
+    if cache is not None:
+        stats = cache.stats()
+        print(f"cache: {stats['hits_memory'] + stats['hits_disk']} hits, {stats['misses']} misses",
+              file=sys.stderr)
+    for row, name, error in report["failures"][:20]:
+        print(f"  row {row} ({name}): {error}", file=sys.stderr)
+    return 1 if report["failures"] else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,177 @@
+"""
+Content-addressed cache of rendered QR images.
+
+Entries are keyed by a hash of everything that affects the output (payload,
+error correction, version, sizes, colors, animation settings and format).
+A size-bounded in-memory LRU sits in front of an on-disk tier that survives
+restarts and evicts its least recently used files once it grows past its
+byte limit. Repeat requests are served straight from cached PNG/GIF bytes.
+"""
+
+import hashlib
+import json
+import os
+import struct
+import tempfile
+import threading
+from collections import OrderedDict
+
+
+def cache_key(**params):
+    """Hash render parameters into a stable hex key."""
+    encoded = json.dumps(params, sort_keys=True, default=str).encode("utf-8")
+    return hashlib.sha256(encoded).hexdigest()
+
+
+def _pack(data, meta):
+    header = json.dumps(meta or {}).encode("utf-8")
+    return struct.pack(">I", len(header)) + header + data
+
+
+def _unpack(blob):
+    (length,) = struct.unpack(">I", blob[:4])
+    return blob[4 + length:], json.loads(blob[4:4 + length])
+
+
+class RenderCache:
+    """
+    Two-tier LRU cache of rendered image bytes with hit/miss counters.
+
+    Values are (data, meta) pairs, where meta is a small JSON-serializable
+    dict (e.g. the QR version) stored alongside the image bytes. Passing
+    directory=None keeps the cache in memory only. Safe to share between
+    threads.
+    """
+
+    def __init__(self, max_memory_bytes=64 * 2 ** 20, directory=None,
+                 max_disk_bytes=512 * 2 ** 20):
+        self.max_memory_bytes = max_memory_bytes
+        self.directory = directory
+        self.max_disk_bytes = max_disk_bytes
+        self._memory = OrderedDict()
+        self._memory_bytes = 0
+        self._lock = threading.Lock()
+        self.hits_memory = 0
+        self.hits_disk = 0
+        self.misses = 0
+
+        self._disk_bytes = 0
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+            self._disk_bytes = sum(size for _, _, size in self._disk_entries())
+
+    def _path(self, key):
+        return os.path.join(self.directory, key[:2], key + ".bin")
+
+    def _disk_entries(self):
+        for root, _, files in os.walk(self.directory):
+            for name in files:
+                if name.endswith(".bin"):
+                    path = os.path.join(root, name)
+                    try:
+                        stat = os.stat(path)
+                    except OSError:
+                        continue
+                    yield path, stat.st_mtime, stat.st_size
+
+    def _remember(self, key, value):
+        # Caller holds the lock
+        if key in self._memory:
+            self._memory_bytes -= len(self._memory.pop(key)[0])
+        if len(value[0]) > self.max_memory_bytes:
+            return
+        self._memory[key] = value
+        self._memory_bytes += len(value[0])
+        while self._memory_bytes > self.max_memory_bytes:
+            _, (evicted, _) = self._memory.popitem(last=False)
+            self._memory_bytes -= len(evicted)
+
+    def get(self, key):
+        """Return (data, meta) for key, or None on a miss."""
+        with self._lock:
+            value = self._memory.get(key)
+            if value is not None:
+                self._memory.move_to_end(key)
+                self.hits_memory += 1
+                return value
+
+        if self.directory:
+            path = self._path(key)
+            try:
+                with open(path, "rb") as f:
+                    value = _unpack(f.read())
+                # Refresh the modification time, which orders disk eviction
+                os.utime(path)
+            except (OSError, ValueError, struct.error):
+                value = None
+
+            if value is not None:
+                with self._lock:
+                    self.hits_disk += 1
+                    self._remember(key, value)
+                return value
+
+        with self._lock:
+            self.misses += 1
+        return None
+
+    def put(self, key, data, meta=None):
+        """Store image bytes (and optional metadata) in both tiers."""
+        with self._lock:
+            self._remember(key, (data, meta or {}))
+
+        if not self.directory:
+            return
+
+        path = self._path(key)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        blob = _pack(data, meta)
+        fd, temporary = tempfile.mkstemp(dir=os.path.dirname(path))
+        with os.fdopen(fd, "wb") as f:
+            f.write(blob)
+        previous = os.path.getsize(path) if os.path.exists(path) else 0
+        os.replace(temporary, path)
+
+        with self._lock:
+            self._disk_bytes += len(blob) - previous
+            over_limit = self._disk_bytes > self.max_disk_bytes
+        if over_limit:
+            self._evict_disk()
+
+    def _evict_disk(self):
+        # Drop least recently used files until the tier is back under 90% of its limit
+        target = self.max_disk_bytes * 0.9
+        entries = sorted(self._disk_entries(), key=lambda entry: entry[1])
+        total = sum(size for _, _, size in entries)
+        for path, _, size in entries:
+            if total <= target:
+                break
+            try:
+                os.remove(path)
+                total -= size
+            except OSError:
+                pass
+        with self._lock:
+            self._disk_bytes = total
+
+    def get_or_render(self, key, render):
+        """Return cached (data, meta), or call render() -> (data, meta) and cache it."""
+        value = self.get(key)
+        if value is None:
+            value = render()
+            self.put(key, *value)
+        return value
+
+    def stats(self):
+        """Hit/miss counters and current tier sizes."""
+        with self._lock:
+            requests = self.hits_memory + self.hits_disk + self.misses
+            return {
+                "hits_memory": self.hits_memory,
+                "hits_disk": self.hits_disk,
+                "misses": self.misses,
+                "hit_rate": (self.hits_memory + self.hits_disk) / requests if requests else 0.0,
+                "memory_entries": len(self._memory),
+                "memory_bytes": self._memory_bytes,
+                "disk_bytes": self._disk_bytes,
+            }
@@ -0,0 +1,81 @@
+"""
+Command-line QR code generator.
+
+Renders a single code from an argument or stdin and writes it to a file or
+stdout, so it fits into shell pipelines. Only the standard library and
+qr_generator are imported up front; qrcode, NumPy and Pillow load when the
+chosen format first needs them.
+
+Usage:
+    python qr_cli.py "https://example.com" -o code.png
+    echo -n "hello" | python qr_cli.py --format svg > code.svg
+    python qr_cli.py "hello" --format gif --frames 8 -o code.gif
+"""
+
+import argparse
+import sys
+
+from qr_generator import ERROR_CORRECTION, MIME_TYPES, render_qr
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Generate a QR code.")
+    parser.add_argument("data", nargs="?", default="-",
+                        help="Text or URL to encode ('-' or omitted: read stdin)")
+    parser.add_argument("-o", "--output", default="-", help="File to write ('-' for stdout)")
+    parser.add_argument("--format", choices=list(MIME_TYPES),
+                        help="Output format (default: from the output extension, else png)")
+    parser.add_argument("--error-correction", choices=list(ERROR_CORRECTION), default="L")
+    parser.add_argument("--version", type=int, help="Fixed QR version (default: auto)")
+    parser.add_argument("--box-size", type=int, default=10)
+    parser.add_argument("--border", type=int, default=4)
+    parser.add_argument("--fill-color", default="#000000")
+    parser.add_argument("--back-color", default="#FFFFFF")
+    parser.add_argument("--frames", type=int, default=5, help="Animation frames (gif only)")
+    parser.add_argument("--duration", type=int, default=200,
+                        help="Frame duration in ms (gif only)")
+    args = parser.parse_args(argv)
+
+    output_format = args.format
+    if output_format is None:
+        extension = args.output.rpartition(".")[2].lower()
+        output_format = extension if args.output != "-" and extension in MIME_TYPES else "png"
+    if args.output == "-" and output_format != "svg" and sys.stdout.isatty():
+        parser.error(f"refusing to write {output_format} to a terminal; use -o or a pipe")
+
+    if args.data == "-":
+        # A single trailing newline comes from echo or a text editor, not the payload
+        data = sys.stdin.read()
+        data = data[:-1] if data.endswith("\n") else data
+    else:
+        data = args.data
+    if not data:
+        parser.error("nothing to encode")
+
+    try:
+        image, version = render_qr(data,
+                                   output_format=output_format,
+                                   fill_color=args.fill_color,
+                                   back_color=args.back_color,
+                                   frames=args.frames,
+                                   duration=args.duration,
+                                   version=args.version,
+                                   error_correction=ERROR_CORRECTION[args.error_correction],
+                                   box_size=args.box_size,
+                                   border=args.border)
+    except Exception as e:
+        print(f"error: {type(e).__name__}: {e}", file=sys.stderr)
+        return 1
+
+    if args.output == "-":
+        sys.stdout.buffer.write(image)
+        sys.stdout.buffer.flush()
+    else:
+        with open(args.output, "wb") as f:
+            f.write(image)
+        print(f"QR code (version {version or 'auto'}) written to {args.output}", file=sys.stderr)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
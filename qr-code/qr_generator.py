@@ -0,0 +1,226 @@
+"""
+QR code generation shared by the Streamlit page and the bulk pipeline.
+
+Keeping the encoding and rendering here, outside the Streamlit script, lets
+worker processes import it without booting a page. Images are produced
+directly from the module matrix: PNGs by NumPy block-repeat into 1-bit
+palette images, SVG and PDF as vector paths without rasterizing.
+
+qrcode, NumPy and Pillow are imported inside the functions that use them,
+so importing this module (and starting the CLI) stays cheap.
+"""
+
+import zlib
+from io import BytesIO
+
+# Error correction levels by their single-letter name; the values of
+# qrcode.constants, spelled out so that importing them doesn't load qrcode
+ERROR_CORRECTION = {
+    "L": 1,
+    "M": 0,
+    "Q": 3,
+    "H": 2,
+}
+
+
+def make_qr(data, fit=False, **kwargs):
+    """
+    Encode data into a QRCode.
+
+    The version is fitted to the data when none is given; with fit=True a
+    given version is only the smallest one tried, otherwise it is kept.
+    """
+    import qrcode
+
+    qr = qrcode.QRCode(**kwargs)
+    qr.add_data(data)
+    qr.make(fit=fit or kwargs.get('version') is None)
+    return qr
+
+
+def rgb_color(color):
+    """
+    Parse any color Pillow understands into an (r, g, b) tuple.
+
+    Every renderer goes through this, so PNG, SVG and PDF accept the same
+    color syntax and user input never reaches the markup as-is. Raises
+    ValueError for anything else.
+    """
+    from PIL import ImageColor
+
+    return ImageColor.getrgb(color)[:3]
+
+
+def hex_color(color):
+    """Normalize a color to "#rrggbb"."""
+    return "#{:02x}{:02x}{:02x}".format(*rgb_color(color))
+
+
+def module_matrix(qr):
+    """Module matrix of an encoded QRCode (border included) as a 0/1 uint8 array."""
+    import numpy as np
+
+    return np.array(qr.get_matrix(), dtype=np.uint8)
+
+
+def rasterize(modules, box_size):
+    """Scale every module to a box_size x box_size block of pixels."""
+    import numpy as np
+
+    return np.repeat(np.repeat(modules, box_size, axis=0), box_size, axis=1)
+
+
+def render_png(modules, box_size, fill_color="#000000", back_color="#FFFFFF"):
+    """Render a module matrix as a 1-bit palette PNG."""
+    from PIL import Image
+
+    pixels = rasterize(modules, box_size)
+    img = Image.frombytes("P", (pixels.shape[1], pixels.shape[0]), pixels.tobytes())
+    # A two-entry palette makes Pillow write a 1-bit PNG
+    img.putpalette(rgb_color(back_color) + rgb_color(fill_color))
+
+    buf = BytesIO()
+    img.save(buf, format="PNG", optimize=False)
+    return buf.getvalue()
+
+
+def _dark_runs(modules):
+    """Yield (row, column, length) for every horizontal run of dark modules."""
+    import numpy as np
+
+    for row, line in enumerate(modules):
+        # Run boundaries are where the padded row changes value
+        edges = np.flatnonzero(np.diff(np.concatenate(([0], line, [0]))))
+        for start, stop in zip(edges[::2], edges[1::2]):
+            yield row, int(start), int(stop - start)
+
+
+def render_svg(modules, box_size, fill_color="#000000", back_color="#FFFFFF"):
+    """Render a module matrix as an SVG document of merged module runs."""
+    fill_color, back_color = hex_color(fill_color), hex_color(back_color)
+    size = modules.shape[0]
+    path = "".join(f"M{column},{row}h{length}v1h-{length}z"
+                   for row, column, length in _dark_runs(modules))
+    pixels = size * box_size
+    svg = (f'<svg xmlns="http://www.w3.org/2000/svg" width="{pixels}" height="{pixels}" '
+           f'viewBox="0 0 {size} {size}" shape-rendering="crispEdges">'
+           f'<rect width="{size}" height="{size}" fill="{back_color}"/>'
+           f'<path d="{path}" fill="{fill_color}"/></svg>')
+    return svg.encode("utf-8")
+
+
+def render_pdf(modules, box_size, fill_color="#000000", back_color="#FFFFFF"):
+    """Render a module matrix as a single-page vector PDF (1 px = 0.75 pt)."""
+    size = modules.shape[0]
+    scale = box_size * 0.75
+
+    def rgb(color):
+        return " ".join(f"{channel / 255:.4f}" for channel in rgb_color(color))
+
+    # Module units, with the origin moved to the top-left corner
+    commands = [f"{scale:.4f} 0 0 {-scale:.4f} 0 {size * scale:.4f} cm",
+                f"{rgb(back_color)} rg 0 0 {size} {size} re f",
+                f"{rgb(fill_color)} rg"]
+    commands += [f"{column} {row} {length} 1 re" for row, column, length in _dark_runs(modules)]
+    commands.append("f")
+    content = zlib.compress("\n".join(commands).encode("ascii"))
+
+    page = size * scale
+    objects = [
+        b"<< /Type /Catalog /Pages 2 0 R >>",
+        b"<< /Type /Pages /Kids [3 0 R] /Count 1 >>",
+        (f"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 {page:.4f} {page:.4f}] "
+         f"/Contents 4 0 R /Resources << >> >>").encode("ascii"),
+        (f"<< /Length {len(content)} /Filter /FlateDecode >>\nstream\n").encode("ascii")
+        + content + b"\nendstream",
+    ]
+
+    out = BytesIO()
+    out.write(b"%PDF-1.4\n")
+    offsets = []
+    for number, body in enumerate(objects, start=1):
+        offsets.append(out.tell())
+        out.write(f"{number} 0 obj\n".encode("ascii") + body + b"\nendobj\n")
+    xref = out.tell()
+    out.write(f"xref\n0 {len(objects) + 1}\n0000000000 65535 f \n".encode("ascii"))
+    for offset in offsets:
+        out.write(f"{offset:010d} 00000 n \n".encode("ascii"))
+    out.write(f"trailer\n<< /Size {len(objects) + 1} /Root 1 0 R >>\n"
+              f"startxref\n{xref}\n%%EOF\n".encode("ascii"))
+    return out.getvalue()
+
+
+# Static output formats: renderer and MIME type
+OUTPUT_FORMATS = {
+    "png": (render_png, "image/png"),
+    "svg": (render_svg, "image/svg+xml"),
+    "pdf": (render_pdf, "application/pdf"),
+}
+
+
+def generate_static_qr(data, fill_color="#000000", back_color="#FFFFFF", output_format="png",
+                       **kwargs):
+    """Render a static QR code as PNG, SVG or PDF bytes; returns (data, version)."""
+    qr = make_qr(data, **kwargs)
+    render, _ = OUTPUT_FORMATS[output_format]
+    image = render(module_matrix(qr), kwargs.get('box_size', 10), fill_color, back_color)
+    return image, qr.version
+
+
+def generate_animated_qr(data, base_color, frames=5, duration=200, **kwargs):
+    from PIL import Image, ImageColor
+
+    # Encode once: data placement, Reed-Solomon and mask selection are frame-independent.
+    # Animated codes grow past a fixed version when the data needs more modules
+    qr = make_qr(data, fit=True, **kwargs)
+
+    # Rasterize the module matrix once as palette indices (0 = background, 1 = module)
+    pixels = rasterize(module_matrix(qr), kwargs.get('box_size', 10))
+    base = Image.frombytes("P", (pixels.shape[1], pixels.shape[0]), pixels.tobytes())
+    back_rgb = ImageColor.getrgb(base_color)[:3]
+
+    # Every frame shares the pixels and only swaps the palette entry of the modules
+    images = []
+    for i in range(frames):
+        # Create color gradient
+        hue = (i / frames) * 360
+        fill_rgb = ImageColor.getrgb(f"hsl({hue}, 100%, 50%)")[:3]
+
+        img = base.copy()
+        img.putpalette(back_rgb + fill_rgb)
+        images.append(img)
+    return images, duration
+
+
+def frames_to_gif(frames, duration):
+    """Write animation frames to GIF bytes."""
+    # Frames are already two-color "P" images, so Pillow's palette
+    # optimization pass would only add work
+    buf = BytesIO()
+    frames[0].save(buf,
+                   format='GIF',
+                   save_all=True,
+                   append_images=frames[1:],
+                   duration=duration,
+                   loop=0,
+                   optimize=False)
+    return buf.getvalue()
+
+
+# Every output format, GIF being the animated one
+MIME_TYPES = {name: mime for name, (_, mime) in OUTPUT_FORMATS.items()}
+MIME_TYPES["gif"] = "image/gif"
+
+
+def render_qr(data, output_format="png", fill_color="#000000", back_color="#FFFFFF",
+              frames=5, duration=200, **kwargs):
+    """
+    Render a QR code in any format of MIME_TYPES; returns (data, version).
+
+    GIF output is animated (frames and duration apply, fill_color does not)
+    and reports no version.
+    """
+    if output_format == "gif":
+        images, duration = generate_animated_qr(data, back_color, frames, duration, **kwargs)
+        return frames_to_gif(images, duration), None
+    return generate_static_qr(data, fill_color, back_color, output_format, **kwargs)
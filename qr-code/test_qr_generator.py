@@ -0,0 +1,33 @@
+import pytest
+from qrcode.exceptions import DataOverflowError
+
+from qr_generator import generate_animated_qr, hex_color, render_qr
+
+
+def test_svg_colors_are_normalized():
+    svg, _ = render_qr("hello", "svg", fill_color="red", back_color="rgb(0, 0, 255)")
+
+    assert b'fill="#ff0000"' in svg
+    assert b'fill="#0000ff"' in svg
+
+
+@pytest.mark.parametrize("output_format", ["png", "svg", "pdf"])
+def test_markup_in_colors_is_rejected(output_format):
+    with pytest.raises(ValueError):
+        render_qr("hello", output_format, fill_color='#000"/><script>alert(1)</script>')
+
+
+def test_hex_color_accepts_pillow_syntax():
+    assert hex_color("#ABC") == "#aabbcc"
+    assert hex_color("hsl(120, 100%, 50%)") == "#00ff00"
+    assert hex_color("#11223344") == "#112233"
+
+
+def test_fixed_version_grows_only_for_animated_codes():
+    data = "x" * 100
+
+    frames, _ = generate_animated_qr(data, "white", frames=2, version=1, box_size=1, border=0)
+    assert frames[0].size[0] > 21
+
+    with pytest.raises(DataOverflowError):
+        render_qr(data, "png", version=1)